@@ -1,43 +1,166 @@
 import udi_interface
+import threading
+import time
 import honeywell_home
+import urllib3
 from honeywell_home.rest import ApiException
-from retry import retry
+from retry import Retrier, RetryLater, DeadlineExceeded, REFRESH, RETRY
+from rate_limiter import RateLimiter, RateLimited
+from circuit_breaker import CircuitBreaker, CircuitOpen, StaleSnapshot
+from single_flight import SingleFlight
+from metrics import Metrics
+from request_templates import RequestTemplate
 from oauthlib.openid.connect.core.exceptions import InvalidTokenError
-
-from oauthlib.oauth2 import BackendApplicationClient
-from oauthlib.oauth2 import OAuth2Token
-from requests_oauthlib.oauth2_session import OAuth2Session
 from urllib.parse import urljoin
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from utilities import *
 
 LOGGER = udi_interface.LOGGER
 
+# Number of seconds before the access token expires that it gets refreshed
+TOKEN_REFRESH_MARGIN = 60
+
+# Connect and read timeouts in seconds for each endpoint
+DEFAULT_TIMEOUTS = {
+    'token': (5, 10),
+    'locations': (5, 30),
+    'thermostats': (5, 20),
+    'thermostat': (5, 10),
+    'sensors': (5, 10),
+    'setpoint': (5, 10),
+    'fanmode': (5, 10),
+    'priority': (5, 10),
+}
+
+# Number of seconds a call may take including token refreshes and retries
+DEFAULT_DEADLINE = 30
+
+# Calls to these endpoints are made for the user and go ahead of the polls
+COMMAND_ENDPOINTS = ('setpoint', 'fanmode', 'priority')
+
+# Number of seconds to hold back polls after a 429 without a Retry-After header
+DEFAULT_RETRY_AFTER = 60
+
+# Number of failed calls in a row after which the API is considered down and number of seconds until it's tried again
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60
+
 
 class ApiHelper:
-    def __init__(self, api_baseurl, client_id, client_secret, user_id):
+    def __init__(self, api_baseurl, client_id, client_secret, user_id, token=None, token_handler=None, pool_maxsize=4, pool_block=False, keep_alive=True, pool_count=4, timeouts=None, deadline=DEFAULT_DEADLINE, fast_decode=False, calls_per_minute=60, circuit_handler=None, metrics=None):
         self._api_baseurl = api_baseurl
         self._client_id = client_id
         self._client_secret = client_secret
         self._user_id = user_id
-        self._auth_client = BackendApplicationClient(client_id=self._client_id)
-        self._oauth = OAuth2Session(client=self._auth_client)
+        self._timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self._limiter = RateLimiter(calls_per_minute)
+        self._retrier = Retrier(self._classify_error, tries=3, base_delay=1, max_delay=10, deadline=deadline, logger=LOGGER)
+
+        # circuit_handler gets called with True when the API is considered down and False when it's back. Until then
+        # the last good results are served as StaleSnapshots to callers that ask for them with stale_ok=True.
+        self._breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, circuit_handler)
+        self._snapshots = {}
+        self._flights = SingleFlight()
+        self._metrics = metrics if metrics is not None else Metrics()
+
+        # With fast_decode records are built from the parsed JSON instead of from the deserialized models
+        self._fast_decode = fast_decode
+        self._decode_args = {'_response_type': 'object'} if fast_decode else {}
 
         configuration = honeywell_home.Configuration()
         configuration.host = self._api_baseurl
         configuration.access_token = None
+        configuration.conditional_requests = True
+        configuration.compress_responses = True
+        configuration.connection_pool_maxsize = pool_maxsize
+        configuration.connection_pool_block = pool_block
+        configuration.connection_pool_num_pools = max(pool_count, 1)
+        configuration.tcp_keepalive = keep_alive
+        # Only reconnect once in urllib3, everything else is up to the retrier so tries don't multiply. urllib3 must not
+        # act on Retry-After either, it would sleep past the deadline and the rate limiter would never hear of the 429.
+        configuration.retries = urllib3.Retry(total=1, read=0, status=0, respect_retry_after_header=False)
         self._api = honeywell_home.DefaultApi(honeywell_home.ApiClient(configuration))
 
+        # Commands go straight to the REST client with pre-built requests instead of through DefaultApi
+        api_client = self._api.api_client
+        self._setpoint_request = RequestTemplate(api_client, 'POST', '/v2/devices/thermostats/{deviceId}', honeywell_home.models.UpdateThermostat, client_id, user_id)
+        self._fanmode_request = RequestTemplate(api_client, 'POST', '/v2/devices/thermostats/{deviceId}/fan', honeywell_home.models.UpdateFanMode, client_id, user_id)
+        self._priority_request = RequestTemplate(api_client, 'PUT', '/v2/devices/thermostats/{deviceId}/priority', honeywell_home.models.UpdatePriority, client_id, user_id)
+
+        # token_handler gets called with every new token so it can be persisted and handed back in as token on restart
+        self._token_handler = token_handler
+        self._token_expires_at = 0
+        self._token_lock = threading.Lock()
+        self._token_timer = None
+        self._closed = False
+
+        if token is not None and token.get('expires_at', 0) - TOKEN_REFRESH_MARGIN > time.time():
+            self._set_token(token['access_token'], token['expires_at'])
+
+    def close(self):
+        with self._token_lock:
+            self._closed = True
+            if self._token_timer is not None:
+                self._token_timer.cancel()
+                self._token_timer = None
+
+        # Token refreshes and commands go over the same pools as the API calls, closing them closes every kept alive
+        # connection. Requests still in flight close their connection when they're done.
+        self._api.api_client.rest_client.pool_manager.clear()
+
+    def get_transfer_stats(self):
+        return self._api.api_client.rest_client.transfer_stats()
+
+    def get_connection_stats(self):
+        return self._api.api_client.rest_client.connection_stats()
+
+    def get_retry_stats(self):
+        return self._retrier.stats.snapshot()
+
+    def get_paused_for(self):
+        return self._limiter.paused_for()
+
+    def get_circuit_state(self):
+        return self._breaker.state
+
+    def get_shared_call_stats(self):
+        return self._flights.stats()
+
     def get_locations(self):
-        return self._call_api(lambda: self._api.v2_locations_get(self._client_id, self._user_id))
+        return self._call_api('locations', lambda timeout: self._api.v2_locations_get(self._client_id, self._user_id, _request_timeout=timeout), key=())
+
+    def get_thermostats(self, location_id, projection=None, blocking=True, stale_ok=False):
+        return self._call_api('thermostats', lambda timeout: self._project_thermostats(projection, self._api.v2_devices_thermostats_get(self._client_id, self._user_id, location_id, _request_timeout=timeout, **self._get_decode_args(projection))), blocking, (location_id, projection), stale_ok)
+
+    def get_thermostat(self, location_id, thermostat_id, projection=None, blocking=True, stale_ok=False):
+        return self._call_api('thermostat', lambda timeout: self._project(projection, self._api.v2_devices_thermostats_device_id_get(self._client_id, self._user_id, location_id, thermostat_id, _request_timeout=timeout, **self._get_decode_args(projection))), blocking, (location_id, thermostat_id, projection), stale_ok)
+
+    def get_sensors(self, location_id, thermostat_id, group_id, projection=None, blocking=True, stale_ok=False):
+        # With a projection the records of the rooms are returned
+        return self._call_api('sensors', lambda timeout: self._project_rooms(projection, self._api.v2_devices_thermostats_device_id_group_group_id_rooms_get(self._client_id, self._user_id, location_id, thermostat_id, group_id, _request_timeout=timeout, **self._get_decode_args(projection))), blocking, (location_id, thermostat_id, group_id, projection), stale_ok)
+
+    def _get_decode_args(self, projection):
+        return self._decode_args if projection is not None else {}
+
+    def _project(self, projection, data):
+        if projection is None:
+            return data
 
-    def get_thermostats(self, location_id):
-        return self._call_api(lambda: self._api.v2_devices_thermostats_get(self._client_id, self._user_id, location_id))
+        return projection.from_json(data) if self._fast_decode else projection.from_model(data)
 
-    def get_thermostat(self, location_id, thermostat_id):
-        return self._call_api(lambda: self._api.v2_devices_thermostats_device_id_get(self._client_id, self._user_id, location_id, thermostat_id))
+    def _project_thermostats(self, projection, thermostats):
+        if projection is None:
+            return thermostats
 
-    def get_sensors(self, location_id, thermostat_id, group_id):
-        return self._call_api(lambda: self._api.v2_devices_thermostats_device_id_group_group_id_rooms_get(self._client_id, self._user_id, location_id, thermostat_id, group_id))
+        return [self._project(projection, thermostat) for thermostat in thermostats]
+
+    def _project_rooms(self, projection, sensors):
+        if projection is None:
+            return sensors
+
+        rooms = sensors.get('rooms') if self._fast_decode else sensors.rooms
+        return [self._project(projection, room) for room in rooms or []]
 
     def set_setpoint(self, location_id, thermostat_id, heat_setpoint, cool_setpoint, use_celcius, mode="Auto", auto_changeover_active=True, thermostat_setpoint_status='TemporaryHold', next_period_time=None):
         if use_celcius:
@@ -47,37 +170,233 @@ class ApiHelper:
             h_setpoint = to_driver_value(heat_setpoint, True)
             c_setpoint = to_driver_value(cool_setpoint, True)
 
-        update = honeywell_home.models.update_thermostat.UpdateThermostat(mode=mode, auto_changeover_active=auto_changeover_active, heat_setpoint=h_setpoint, cool_setpoint=c_setpoint, thermostat_setpoint_status=thermostat_setpoint_status, next_period_time=next_period_time)
+        update = honeywell_home.models.UpdateThermostat(mode=mode, auto_changeover_active=auto_changeover_active, heat_setpoint=h_setpoint, cool_setpoint=c_setpoint, thermostat_setpoint_status=thermostat_setpoint_status, next_period_time=next_period_time)
 
-        self._call_api(lambda: self._api.v2_devices_thermostats_device_id_post(self._client_id, self._user_id, location_id, thermostat_id, update))
+        self._call_api('setpoint', lambda timeout: self._setpoint_request.send(location_id, thermostat_id, update, timeout))
 
     def set_fanmode(self, location_id, thermostat_id, mode):
-        update = honeywell_home.models.update_fan_mode.UpdateFanMode(mode)
-        self._call_api(lambda: self._api.v2_devices_thermostats_device_id_fan_post_with_http_info(self._client_id, self._user_id, location_id, thermostat_id, update))
+        update = honeywell_home.models.UpdateFanMode(mode)
+        self._call_api('fanmode', lambda timeout: self._fanmode_request.send(location_id, thermostat_id, update, timeout))
 
     def set_priority(self, location_id, thermostat_id, priority_type):
-        current_priority = honeywell_home.models.update_priority_current_priority.UpdatePriorityCurrentPriority(priority_type)
-        update = honeywell_home.models.update_priority.UpdatePriority(current_priority)
-        self._call_api(lambda: self._api.v2_devices_thermostats_device_id_priority_put(self._client_id, self._user_id, location_id, thermostat_id, update))
+        current_priority = honeywell_home.models.UpdatePriorityCurrentPriority(priority_type)
+        update = honeywell_home.models.UpdatePriority(current_priority)
+        self._call_api('priority', lambda timeout: self._priority_request.send(location_id, thermostat_id, update, timeout))
+
+    def _call_api(self, endpoint, function, blocking=True, key=None, stale_ok=False):
+        # function gets called with the urllib3.Timeout to use for the request. Retries stop once the deadline
+        # would be passed so a call never takes much longer than the deadline. With blocking=False RetryLater is
+        # raised instead of waiting between tries or for the rate limiter.
+        # Tries that the rate limiter or the circuit breaker turned away don't count as requests, sent remembers
+        # whether one actually went out so only the ones after it are counted as retries
+        sent = [False]
+        call = lambda: self._with_snapshot((endpoint,) + key if stale_ok else None, lambda: self._retrier.call(lambda remaining: self._call_api_once(endpoint, function, remaining, blocking, sent), blocking))
+        if key is None:
+            return call()
+
+        # Reads with a key are shared by everyone asking for the same thing at the same time. How they are asked for
+        # is part of the key so nobody gets a RetryLater or StaleSnapshot they can't handle.
+        flight_key = (endpoint, blocking, stale_ok) + key
+        return self._flights.do(flight_key, lambda: self._share_retry(flight_key, call))
+
+    def _share_retry(self, flight_key, call):
+        # Everyone who shared a call that has to be tried again gets the same RetryLater, the retry is shared too
+        try:
+            return call()
+        except RetryLater as ex:
+            retry = ex.retry
+            ex.retry = lambda: self._flights.do(flight_key, lambda: self._share_retry(flight_key, retry))
+            raise
+
+    def _with_snapshot(self, snapshot_key, call):
+        # Remembers the result under snapshot_key and hands it back as a StaleSnapshot while the circuit is open
+        try:
+            result = call()
+        except CircuitOpen:
+            snapshot = self._snapshots.get(snapshot_key) if snapshot_key is not None else None
+            if snapshot is None:
+                raise
+            return snapshot
+        except RetryLater as ex:
+            retry = ex.retry
+            ex.retry = lambda: self._with_snapshot(snapshot_key, retry)
+            raise
+
+        if snapshot_key is not None:
+            self._snapshots[snapshot_key] = StaleSnapshot(result, time.time())
+        return result
+
+    def _call_api_once(self, endpoint, function, remaining, blocking, sent=None):
+        end = None if remaining is None else time.monotonic() + remaining
+        # Fail fast while the circuit is open instead of waiting for and using up a rate limiter token. The probe is
+        # only taken after the token so a call that gets rate limited can't leave the circuit half open.
+        self._breaker.check()
+        wait = self._limiter.acquire(endpoint in COMMAND_ENDPOINTS, remaining if blocking else 0)
+        if wait:
+            raise RateLimited(wait)
+
+        # Waiting for the rate limiter uses up time left until the deadline
+        remaining = self._get_remaining(end)
+        self._breaker.before_call()
 
-    @retry(InvalidTokenError, tries=3)
-    def _call_api(self, function):
+        start = None
         try:
-            if self._api.api_client.configuration.access_token is None:
-                self._refresh_token()
+            if self._token_expired():
+                self._refresh_token(timeout=self._get_timeout('token', remaining))
+                remaining = None if end is None else end - time.monotonic()
+
+            timeout = self._get_timeout(endpoint, remaining)
+            if sent is not None:
+                if sent[0]:
+                    self._metrics.record_retry(endpoint)
+                sent[0] = True
+
+            start = time.monotonic()
+            result = function(timeout)
+        except Exception as ex:
+            if start is not None:
+                self._metrics.record_call(endpoint, time.monotonic() - start, self._get_error_status(ex))
+
+            # Any answer from the API, even an error, means it's up
+            if self._is_outage(ex):
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            self._handle_error(ex)
+            raise
 
-            return function()
-        except ApiException as ex:
+        self._metrics.record_call(endpoint, time.monotonic() - start)
+        self._breaker.record_success()
+        return result
+
+    def _handle_error(self, ex):
+        if isinstance(ex, ApiException):
             if ex.status == 401:
                 self._api.api_client.configuration.access_token = None
                 raise InvalidTokenError(status_code=ex.status, description=ex.reason)
+            elif ex.status == 429:
+                # Hold back the polls until the API lets us make calls again, commands still go through
+                ex.retry_after = self._get_retry_after(ex)
+                LOGGER.warning("Honeywell API call limit reached, pausing polls for %s seconds", int(ex.retry_after))
+                self._limiter.pause(ex.retry_after)
+            elif ex.status == 503 and ex.headers and 'Retry-After' in ex.headers:
+                # Let the retrier wait as long as the API asks for, it gives up if that's past the deadline
+                ex.retry_after = self._get_retry_after(ex)
 
-            raise
+    @staticmethod
+    def _get_error_status(ex):
+        if isinstance(ex, ApiException):
+            return str(ex.status)
+        elif isinstance(ex, urllib3.exceptions.TimeoutError) or isinstance(getattr(ex, 'reason', None), urllib3.exceptions.TimeoutError):
+            return 'timeout'
+        elif isinstance(ex, (urllib3.exceptions.MaxRetryError, urllib3.exceptions.ProtocolError, ConnectionError)):
+            return 'connection'
+
+        return 'other'
+
+    @staticmethod
+    def _is_outage(ex):
+        if isinstance(ex, ApiException):
+            return ex.status >= 500
+        return isinstance(ex, (urllib3.exceptions.MaxRetryError, urllib3.exceptions.ProtocolError, urllib3.exceptions.TimeoutError, ConnectionError))
 
-    def _refresh_token(self):
-        url = urljoin(self._api_baseurl, "oauth2/accesstoken")
-        token = OAuth2Token(self._oauth.fetch_token(token_url=url,
-                                                          client_id=self._client_id,
-                                                          client_secret=self._client_secret))
+    @staticmethod
+    def _get_retry_after(ex):
+        value = ex.headers.get('Retry-After') if ex.headers else None
+        if value is None:
+            return DEFAULT_RETRY_AFTER
+
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        try:
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0)
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER
 
-        self._api.api_client.configuration.access_token = token['access_token']
+    @staticmethod
+    def _classify_error(ex):
+        # Get a new token right away when it was rejected, back off when the API is busy or the connection failed
+        # and give up on everything else like bad requests
+        if isinstance(ex, InvalidTokenError):
+            return REFRESH
+        elif isinstance(ex, RateLimited):
+            return RETRY
+        elif isinstance(ex, ApiException):
+            return RETRY if ex.status == 429 or ex.status >= 500 else None
+        elif isinstance(ex, (urllib3.exceptions.MaxRetryError, urllib3.exceptions.ProtocolError, urllib3.exceptions.TimeoutError, ConnectionError)):
+            return RETRY
+
+        return None
+
+    @staticmethod
+    def _get_remaining(end):
+        if end is None:
+            return None
+
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded()
+        return remaining
+
+    def _get_timeout(self, endpoint, remaining=None):
+        connect, read = self._timeouts[endpoint]
+        if remaining is None:
+            return urllib3.Timeout(connect=connect, read=read)
+
+        remaining = max(remaining, 0.1)
+        return urllib3.Timeout(connect=min(connect, remaining), read=min(read, remaining), total=remaining)
+
+    def _token_expired(self):
+        return self._api.api_client.configuration.access_token is None or time.time() >= self._token_expires_at - TOKEN_REFRESH_MARGIN
+
+    def _refresh_token(self, stale_token=None, timeout=None):
+        with self._token_lock:
+            # Another thread may have refreshed the token while we were waiting for the lock
+            access_token = self._api.api_client.configuration.access_token
+            if access_token != stale_token and not self._token_expired():
+                return
+
+            # Fetch the token over the same connection pool as the API calls instead of opening a separate connection
+            url = urljoin(self._api_baseurl, "oauth2/accesstoken")
+            headers = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(self._client_id, self._client_secret))
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            start = time.monotonic()
+            try:
+                response = self._api.api_client.rest_client.POST(url, headers=headers, post_params={'grant_type': 'client_credentials'}, _request_timeout=timeout or self._get_timeout('token'))
+            except Exception as ex:
+                self._metrics.record_call('token', time.monotonic() - start, self._get_error_status(ex))
+                raise
+            self._metrics.record_call('token', time.monotonic() - start)
+            token = self._api.api_client.rest_client.codec.loads(response.content)
+
+            expires_at = token.get('expires_at', time.time() + int(token.get('expires_in', 0)))
+            LOGGER.debug("Refreshed access token, expires in %s seconds", int(expires_at - time.time()))
+            self._set_token(token['access_token'], expires_at)
+
+        if self._token_handler is not None:
+            self._token_handler({'access_token': token['access_token'], 'expires_at': expires_at})
+
+    def _set_token(self, access_token, expires_at):
+        self._api.api_client.configuration.access_token = access_token
+        self._token_expires_at = expires_at
+
+        # Refresh the token in the background shortly before it expires so polls never have to wait for it
+        if self._token_timer is not None:
+            self._token_timer.cancel()
+
+        delay = expires_at - TOKEN_REFRESH_MARGIN - time.time()
+        if self._closed or delay <= 0:
+            return
+
+        self._token_timer = threading.Timer(delay, self._background_refresh, (access_token,))
+        self._token_timer.daemon = True
+        self._token_timer.start()
+
+    def _background_refresh(self, access_token):
+        try:
+            self._refresh_token(access_token)
+        except Exception as ex:
+            LOGGER.exception("Background access token refresh failed %s", ex)
@@ -0,0 +1,53 @@
+"""
+Times building and sending a thermostat command through the generated DefaultApi methods and through the
+pre-built request templates. The HTTP request itself is left out, both hand their request to a REST client that
+returns right away.
+
+    python bench/command_requests.py
+"""
+import common
+
+
+class Response:
+    status = 200
+    reason = 'OK'
+    data = ''
+    content = b''
+
+    def getheaders(self):
+        return {}
+
+    def getheader(self, name, default=None):
+        return default
+
+
+def measure():
+    import honeywell_home
+    from request_templates import RequestTemplate
+
+    configuration = honeywell_home.Configuration()
+    configuration.host = 'https://api.honeywell.com'
+    configuration.access_token = 'token'
+    api = honeywell_home.DefaultApi(honeywell_home.ApiClient(configuration))
+    api.api_client.rest_client.request = lambda *args, **kwargs: Response()
+
+    setpoint = honeywell_home.models.UpdateThermostat(mode='Heat', auto_changeover_active=False, heat_setpoint=69, cool_setpoint=76, thermostat_setpoint_status='TemporaryHold')
+    fanmode = honeywell_home.models.UpdateFanMode('Auto')
+    priority = honeywell_home.models.UpdatePriority(honeywell_home.models.UpdatePriorityCurrentPriority('PickARoom'))
+
+    setpoint_request = RequestTemplate(api.api_client, 'POST', '/v2/devices/thermostats/{deviceId}', honeywell_home.models.UpdateThermostat, 'client', 'user')
+    fanmode_request = RequestTemplate(api.api_client, 'POST', '/v2/devices/thermostats/{deviceId}/fan', honeywell_home.models.UpdateFanMode, 'client', 'user')
+    priority_request = RequestTemplate(api.api_client, 'PUT', '/v2/devices/thermostats/{deviceId}/priority', honeywell_home.models.UpdatePriority, 'client', 'user')
+
+    return {
+        'setpoint DefaultApi (old path)': common.per_call(lambda: api.v2_devices_thermostats_device_id_post('client', 'user', 123, 'LCC-00D02DB89E33', setpoint)),
+        'setpoint RequestTemplate': common.per_call(lambda: setpoint_request.send(123, 'LCC-00D02DB89E33', setpoint)),
+        'fanmode DefaultApi (old path)': common.per_call(lambda: api.v2_devices_thermostats_device_id_fan_post('client', 'user', 123, 'LCC-00D02DB89E33', fanmode)),
+        'fanmode RequestTemplate': common.per_call(lambda: fanmode_request.send(123, 'LCC-00D02DB89E33', fanmode)),
+        'priority DefaultApi (old path)': common.per_call(lambda: api.v2_devices_thermostats_device_id_priority_put('client', 'user', 123, 'LCC-00D02DB89E33', priority)),
+        'priority RequestTemplate': common.per_call(lambda: priority_request.send(123, 'LCC-00D02DB89E33', priority)),
+    }
+
+
+if __name__ == '__main__':
+    common.main(measure, 'Sending thermostat commands without the HTTP request', compare=False)
@@ -0,0 +1,102 @@
+"""Helpers shared by the benchmarks."""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'payloads')
+
+
+def load_payload(name):
+    """Returns the bytes of a sample response from bench/payloads."""
+    with open(os.path.join(PAYLOADS, name + '.json'), 'rb') as f:
+        return f.read()
+
+
+def per_call(f, number=1000, repeat=5):
+    """Returns the seconds one call of f takes, the best of repeat runs of number calls."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            f()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def initial_revision():
+    """Returns the first commit, it has the client as it came out of the generator."""
+    return subprocess.check_output(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=ROOT, text=True).split()[0]
+
+
+def export_client(revision, directory):
+    """Writes honeywell_home as it was at revision to directory."""
+    archive = subprocess.check_output(['git', 'archive', revision, 'honeywell_home'], cwd=ROOT)
+    subprocess.run(['tar', '-x', '-C', directory], input=archive, check=True)
+
+
+def _run_measure(script, path):
+    env = dict(os.environ, PYTHONPATH=path)
+    output = subprocess.check_output([sys.executable, script, '--measure'], env=env, text=True)
+    return json.loads(output)
+
+
+def report(title, rows, baseline=None, unit='us', scale=1e6):
+    """
+    Prints the rows, and the baseline rows with the same name next to them when there are any. Rows are seconds,
+    or [value, unit] for anything that isn't a time.
+    """
+    print(title)
+    if baseline is not None:
+        print('  {0:<45} {1:>12} {2:>12}'.format('', 'before', 'after'))
+
+    for name, value in rows.items():
+        before = baseline.get(name) if baseline is not None else None
+        row_unit, row_scale = unit, scale
+        if isinstance(value, list):
+            (value, row_unit), row_scale = value, 1
+            before = before[0] if before is not None else None
+
+        if baseline is None:
+            print('  {0:<45} {1:>12.2f} {2}'.format(name, value * row_scale, row_unit))
+            continue
+
+        line = '  {0:<45} {1:>12} {2:>12.2f} {3:<6}'.format(name, '-' if before is None else '{0:.2f}'.format(before * row_scale), value * row_scale, row_unit)
+        if before is not None and value:
+            line += ' {0:.2f}x'.format(before / value)
+        print(line)
+
+
+def main(measure, title, unit='us', scale=1e6, compare=True):
+    """
+    Runs measure and prints what it returns. With compare=True measure runs once against the client in this tree
+    and once against the client at --baseline, each in its own process.
+    """
+    parser = argparse.ArgumentParser(description=title)
+    parser.add_argument('--baseline', help='git revision to compare against, defaults to the first commit')
+    parser.add_argument('--measure', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # udi_interface sends stdout to its log, so write to the real one
+        results = measure()
+        sys.__stdout__.write(json.dumps(results) + '\n')
+        return
+
+    if not compare:
+        sys.path.insert(0, ROOT)
+        report(title, measure(), unit=unit, scale=scale)
+        return
+
+    script = os.path.abspath(sys.argv[0])
+    revision = args.baseline or initial_revision()
+    with tempfile.TemporaryDirectory() as directory:
+        export_client(revision, directory)
+        baseline = _run_measure(script, directory)
+
+    report('{0} ({1} -> working tree)'.format(title, revision[:10]), _run_measure(script, ROOT), baseline, unit, scale)
@@ -0,0 +1,69 @@
+"""
+Polls a local stub of the thermostats endpoint that always returns the same sample response with an ETag and times
+a poll before and after the REST client started making conditional requests.
+
+    python bench/conditional_get.py [--baseline REV]
+"""
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import common
+
+POLLS = 200
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes, with Nagle on they wait for a delayed ACK
+    disable_nagle_algorithm = True
+    body = common.load_payload('thermostats')
+    etag = '"{0}"'.format(hashlib.sha1(body).hexdigest())
+    sent = 0
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', self.etag)
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+        StubHandler.sent += len(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure():
+    import honeywell_home
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    configuration = honeywell_home.Configuration()
+    configuration.host = 'http://127.0.0.1:{0}'.format(server.server_port)
+    configuration.access_token = 'token'
+    configuration.conditional_requests = True
+    api = honeywell_home.DefaultApi(honeywell_home.ApiClient(configuration))
+
+    poll = lambda: api.v2_devices_thermostats_get('client', 'user', 123)
+    poll()
+    StubHandler.sent = 0
+    results = {
+        'poll of an unchanged response': common.per_call(poll, POLLS, 3),
+        'body bytes received per poll': [StubHandler.sent / (POLLS * 3), 'bytes'],
+    }
+
+    server.shutdown()
+    return results
+
+
+if __name__ == '__main__':
+    common.main(measure, 'Polling an unchanged thermostats response from a local stub server')
@@ -0,0 +1,56 @@
+"""
+Times turning the sample responses into models, before and after the decoders were compiled per type, and turning
+them into the records the nodes use with and without fast_decode.
+
+    python bench/deserialize.py [--baseline REV]
+"""
+import json
+
+import common
+
+PAYLOADS = (('thermostat', 'Thermostat'), ('thermostats', 'list[Thermostat]'), ('locations', 'list[Location]'), ('sensors', 'ThermostatSensor'))
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+        self.data = content.decode('utf8')
+
+
+def measure():
+    import honeywell_home
+
+    client = honeywell_home.ApiClient()
+    decode = getattr(client, '_ApiClient__deserialize')
+
+    results = {}
+    for name, response_type in PAYLOADS:
+        content = common.load_payload(name)
+        data = json.loads(content)
+        response = Response(content)
+        results['{0} parsed -> models'.format(name)] = common.per_call(lambda: decode(data, response_type))
+        results['{0} bytes -> models'.format(name)] = common.per_call(lambda: client.deserialize(response, response_type))
+
+    try:
+        import projection
+    except ImportError:
+        # The tree being compared against has no projections
+        return results
+
+    import thermostat
+    import indoor_air_sensor
+
+    content = common.load_payload('thermostats')
+    data = json.loads(content)
+    models = decode(data, 'list[Thermostat]')
+    results['thermostats parsed -> records'] = common.per_call(lambda: [thermostat.THERMOSTAT_PROJECTION.from_json(item) for item in data])
+    results['thermostats models -> records'] = common.per_call(lambda: [thermostat.THERMOSTAT_PROJECTION.from_model(item) for item in models])
+
+    content = common.load_payload('sensors')
+    data = json.loads(content)
+    results['sensors parsed -> records'] = common.per_call(lambda: [indoor_air_sensor.ROOM_PROJECTION.from_json(item) for item in data['rooms']])
+    return results
+
+
+if __name__ == '__main__':
+    common.main(measure, 'Deserializing sample responses')
@@ -0,0 +1,81 @@
+"""
+Measures the startup imports with python -X importtime and counts the model modules that get loaded. Exits with 1
+when the node server loads more model modules than MAX_MODEL_MODULES so a change that imports them up front again
+shows up.
+
+    python bench/import_time.py [--baseline REV]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import common
+
+# Model modules loaded by starting the node server, the ones the projections and request templates are built from
+MAX_MODEL_MODULES = 11
+
+COUNT_MODELS = "import sys; sys.__stdout__.write(str(sum(1 for name in sys.modules if name.startswith('honeywell_home.models.'))))"
+
+IMPORT_CLIENT = 'import honeywell_home; ' + COUNT_MODELS
+
+IMPORT_NODE_SERVER = ("import importlib.util; "
+                      "spec = importlib.util.spec_from_file_location('honeywellhome_poly', 'honeywellhome-poly.py'); "
+                      "spec.loader.exec_module(importlib.util.module_from_spec(spec)); ") + COUNT_MODELS
+
+
+def import_time(code, path, runs=5):
+    """Returns the best time in seconds the imports of code took and the number of model modules it loaded."""
+    best = None
+    models = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=path, env=dict(os.environ, PYTHONPATH=path), capture_output=True, text=True, check=True)
+
+        # Lines look like "import time:   self [us] | cumulative | imported package", top level imports aren't indented
+        total = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit() and not name.startswith('  '):
+                total += int(cumulative)
+
+        best = total if best is None else min(best, total)
+        models = int(result.stdout.strip().splitlines()[-1])
+
+    return best / 1e6, models
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup import time')
+    parser.add_argument('--baseline', help='git revision to compare importing honeywell_home against, defaults to the first commit')
+    args = parser.parse_args()
+
+    revision = args.baseline or common.initial_revision()
+    with tempfile.TemporaryDirectory() as directory:
+        common.export_client(revision, directory)
+        before, before_models = import_time(IMPORT_CLIENT, directory)
+
+    after, after_models = import_time(IMPORT_CLIENT, common.ROOT)
+    node_server, node_server_models = import_time(IMPORT_NODE_SERVER, common.ROOT)
+
+    common.report('Startup imports ({0} -> working tree)'.format(revision[:10]), {
+        'import honeywell_home': after,
+        'honeywell_home model modules': [after_models, 'modules'],
+    }, {
+        'import honeywell_home': before,
+        'honeywell_home model modules': [before_models, 'modules'],
+    }, unit='ms', scale=1e3)
+    common.report('Node server', {
+        'import honeywellhome-poly.py': node_server,
+        'model modules loaded': [node_server_models, 'modules'],
+    }, unit='ms', scale=1e3)
+
+    if node_server_models > MAX_MODEL_MODULES:
+        print('Starting the node server loads {0} model modules, more than the {1} allowed by MAX_MODEL_MODULES'.format(node_server_models, MAX_MODEL_MODULES))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
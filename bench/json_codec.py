@@ -0,0 +1,35 @@
+"""
+Times parsing the sample responses and serializing a request body with each installed JSON codec, next to how the
+REST client did it before the codecs: decode the body to str, then json.loads.
+
+    python bench/json_codec.py
+"""
+import json
+
+import common
+
+PAYLOADS = ('thermostat', 'thermostats', 'locations', 'sensors')
+
+BODY = {'mode': 'Heat', 'autoChangeoverActive': False, 'heatSetpoint': 69, 'coolSetpoint': 76, 'thermostatSetpointStatus': 'TemporaryHold'}
+
+
+def measure():
+    from honeywell_home import codec
+
+    codecs = [codec.get_codec(name) for name in ('orjson', 'simdjson', 'json') if name == 'json' or getattr(codec, name) is not None]
+
+    results = {}
+    for name in PAYLOADS:
+        content = common.load_payload(name)
+        results['{0} decode + json.loads (old path)'.format(name)] = common.per_call(lambda: json.loads(content.decode('utf8')))
+        for json_codec in codecs:
+            results['{0} {1}.loads(bytes)'.format(name, json_codec.name)] = common.per_call(lambda: json_codec.loads(content))
+
+    results['request body json.dumps (old path)'] = common.per_call(lambda: json.dumps(BODY), 10000)
+    for json_codec in codecs:
+        results['request body {0}.dumps'.format(json_codec.name)] = common.per_call(lambda: json_codec.dumps(BODY), 10000)
+    return results
+
+
+if __name__ == '__main__':
+    common.main(measure, 'Parsing sample responses with each JSON codec', compare=False)
@@ -0,0 +1,41 @@
+"""
+Measures the memory a deserialized sample response takes and how fast the attributes of the models are read and
+compared, before and after the models got __slots__.
+
+    python bench/models.py [--baseline REV]
+"""
+import json
+import tracemalloc
+
+import common
+
+COPIES = 1000
+
+
+def measure():
+    import honeywell_home
+
+    client = honeywell_home.ApiClient()
+    decode = getattr(client, '_ApiClient__deserialize')
+    thermostat_data = json.loads(common.load_payload('thermostat'))
+    sensors_data = json.loads(common.load_payload('sensors'))
+
+    results = {}
+    for name, data, response_type in (('Thermostat', thermostat_data, 'Thermostat'), ('ThermostatSensor', sensors_data, 'ThermostatSensor')):
+        decode(data, response_type)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [decode(data, response_type) for _ in range(COPIES)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results['{0} memory'.format(name)] = [(after - before) / len(kept), 'bytes']
+
+    thermostat = decode(thermostat_data, 'Thermostat')
+    other = decode(thermostat_data, 'Thermostat')
+    results['read 5 thermostat attributes'] = common.per_call(lambda: (thermostat.indoor_temperature, thermostat.changeable_values.heat_setpoint, thermostat.changeable_values.cool_setpoint, thermostat.settings.fan.changeable_values.mode, thermostat.is_alive), 100000)
+    results['compare equal thermostats'] = common.per_call(lambda: thermostat == other, 10000)
+    return results
+
+
+if __name__ == '__main__':
+    common.main(measure, 'Model memory and attribute access')
@@ -0,0 +1,106 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    """Raised instead of making a call while the circuit is open."""
+    def __init__(self, retry_after):
+        super().__init__('Honeywell API is unavailable, next try in {0:.0f} seconds'.format(retry_after))
+        self.retry_after = retry_after
+
+
+class StaleSnapshot:
+    """
+    Last good result of a call, served while the circuit is open.
+
+    Args:
+        value: The result.
+        taken_at: Unix time the result was received.
+    """
+    __slots__ = ('value', 'taken_at')
+
+    def __init__(self, value, taken_at):
+        self.value = value
+        self.taken_at = taken_at
+
+
+class CircuitBreaker:
+    """
+    Stops calls to the API after repeated failures so an outage doesn't turn every poll into a pile of timeouts.
+    Once reset_timeout seconds have passed a single call is let through as a probe. The circuit closes when it
+    succeeds and stays open for another reset_timeout seconds when it fails.
+
+    Args:
+        failure_threshold: Number of failures in a row that open the circuit.
+        reset_timeout: Number of seconds to wait before probing whether the API is back.
+        listener: Function called with True when the circuit opens and False when it closes.
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=60, listener=None):
+        self._lock = threading.Lock()
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._listener = listener
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0
+
+    @property
+    def state(self):
+        return self._state
+
+    def check(self):
+        """Raises CircuitOpen if the call can't be made right now, without taking the probe."""
+        with self._lock:
+            self._check()
+
+    def before_call(self):
+        """Raises CircuitOpen if the call can't be made right now."""
+        with self._lock:
+            if self._check():
+                # Let this call through as the probe, everything else keeps failing fast until it's done
+                self._state = HALF_OPEN
+
+    def _check(self):
+        # Returns True when the call can go ahead as the probe
+        if self._state == CLOSED:
+            return False
+
+        wait = self._opened_at + self._reset_timeout - time.monotonic()
+        if self._state == OPEN and wait <= 0:
+            return True
+
+        raise CircuitOpen(max(wait, 0))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state == CLOSED:
+                return
+
+            self._state = CLOSED
+
+        self._notify(False)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                return
+
+            if self._state == OPEN or self._failures < self._failure_threshold:
+                return
+
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+
+        self._notify(True)
+
+    def _notify(self, is_open):
+        if self._listener is not None:
+            self._listener(is_open)
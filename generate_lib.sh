@@ -1,7 +1,29 @@
 #!/usr/bin/env bash
+# Generates the honeywell_home client from the OpenAPI spec and applies the changes in patches/honeywell_home.patch
+# on top of it. After changing files in honeywell_home run it with --update-patch to record the changes in the
+# patch, otherwise the next run throws them away.
+set -e
 
 openapi-generator generate -c codegen-config.json -i honeywellhome.api.yaml -g python -o sdk
 
+if [ "$1" == "--update-patch" ]; then
+    set +e
+    diff -ruN -x __pycache__ sdk/honeywell_home honeywell_home > sdk/honeywell_home.patch
+    status=$?
+    set -e
+    if [ $status -gt 1 ]; then
+        exit $status
+    fi
+
+    # Both sides are named after honeywell_home and without timestamps so the patch applies with -p0 and only
+    # changes when the code does
+    sed -E -e 's#^--- sdk/honeywell_home/#--- honeywell_home/#' -e 's#^((---|\+\+\+) [^\t]*)\t.*#\1#' sdk/honeywell_home.patch > patches/honeywell_home.patch
+    rm -r sdk
+    exit 0
+fi
+
 rm -r honeywell_home
 mv sdk/honeywell_home honeywell_home
 rm -r sdk
+
+patch -p0 --no-backup-if-mismatch < patches/honeywell_home.patch
@@ -27,37 +27,14 @@ from honeywell_home.exceptions import ApiTypeError
 from honeywell_home.exceptions import ApiValueError
 from honeywell_home.exceptions import ApiKeyError
 from honeywell_home.exceptions import ApiException
-# import models into sdk package
-from honeywell_home.models.location import Location
-from honeywell_home.models.location_configuration import LocationConfiguration
-from honeywell_home.models.location_configuration_face_recognition import LocationConfigurationFaceRecognition
-from honeywell_home.models.location_configuration_face_recognition_schedules import LocationConfigurationFaceRecognitionSchedules
-from honeywell_home.models.location_configuration_face_recognition_time import LocationConfigurationFaceRecognitionTime
-from honeywell_home.models.location_geo_fences import LocationGeoFences
-from honeywell_home.models.location_geo_occupancy import LocationGeoOccupancy
-from honeywell_home.models.location_location_role_mapping import LocationLocationRoleMapping
-from honeywell_home.models.location_users import LocationUsers
-from honeywell_home.models.thermostat import Thermostat
-from honeywell_home.models.thermostat_changeable_values import ThermostatChangeableValues
-from honeywell_home.models.thermostat_current_schedule_period import ThermostatCurrentSchedulePeriod
-from honeywell_home.models.thermostat_groups import ThermostatGroups
-from honeywell_home.models.thermostat_operation_status import ThermostatOperationStatus
-from honeywell_home.models.thermostat_schedule_capabilities import ThermostatScheduleCapabilities
-from honeywell_home.models.thermostat_schedule_type import ThermostatScheduleType
-from honeywell_home.models.thermostat_sensor import ThermostatSensor
-from honeywell_home.models.thermostat_sensor_accessories import ThermostatSensorAccessories
-from honeywell_home.models.thermostat_sensor_accessory_attribute import ThermostatSensorAccessoryAttribute
-from honeywell_home.models.thermostat_sensor_accessory_value import ThermostatSensorAccessoryValue
-from honeywell_home.models.thermostat_sensor_rooms import ThermostatSensorRooms
-from honeywell_home.models.thermostat_settings import ThermostatSettings
-from honeywell_home.models.thermostat_settings_fan import ThermostatSettingsFan
-from honeywell_home.models.thermostat_settings_fan_changeable_values import ThermostatSettingsFanChangeableValues
-from honeywell_home.models.thermostat_settings_hardware_settings import ThermostatSettingsHardwareSettings
-from honeywell_home.models.thermostat_settings_special_mode import ThermostatSettingsSpecialMode
-from honeywell_home.models.thermostat_settings_temperature_mode import ThermostatSettingsTemperatureMode
-from honeywell_home.models.thermostat_vacation_hold import ThermostatVacationHold
-from honeywell_home.models.update_fan_mode import UpdateFanMode
-from honeywell_home.models.update_priority import UpdatePriority
-from honeywell_home.models.update_priority_current_priority import UpdatePriorityCurrentPriority
-from honeywell_home.models.update_thermostat import UpdateThermostat
+# import models into sdk package when they are first used
+import honeywell_home.models
 
+
+def __getattr__(name):
+    """Returns a model from honeywell_home.models, importing it if needed."""
+    if name in honeywell_home.models.__all__:
+        return getattr(honeywell_home.models, name)
+
+    raise AttributeError(
+        "module {0!r} has no attribute {1!r}".format(__name__, name))
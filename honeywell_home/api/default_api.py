@@ -57,6 +57,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: None
                  If the method is called asynchronously,
                  returns the request thread.
@@ -87,6 +90,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: None
                  If the method is called asynchronously,
                  returns the request thread.
@@ -99,6 +105,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -166,7 +173,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type=None,  # noqa: E501
+            response_type=local_var_params.get('_response_type'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
@@ -194,6 +201,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: Thermostat
                  If the method is called asynchronously,
                  returns the request thread.
@@ -223,6 +233,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: tuple(Thermostat, status_code(int), headers(HTTPHeaderDict))
                  If the method is called asynchronously,
                  returns the request thread.
@@ -235,6 +248,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -296,7 +310,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type='Thermostat',  # noqa: E501
+            response_type=local_var_params.get('_response_type', 'Thermostat'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
@@ -325,6 +339,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: ThermostatSensor
                  If the method is called asynchronously,
                  returns the request thread.
@@ -355,6 +372,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: tuple(ThermostatSensor, status_code(int), headers(HTTPHeaderDict))
                  If the method is called asynchronously,
                  returns the request thread.
@@ -367,6 +387,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -434,7 +455,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type='ThermostatSensor',  # noqa: E501
+            response_type=local_var_params.get('_response_type', 'ThermostatSensor'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
@@ -463,6 +484,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: None
                  If the method is called asynchronously,
                  returns the request thread.
@@ -493,6 +517,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: None
                  If the method is called asynchronously,
                  returns the request thread.
@@ -505,6 +532,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -572,7 +600,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type=None,  # noqa: E501
+            response_type=local_var_params.get('_response_type'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
@@ -601,6 +629,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: None
                  If the method is called asynchronously,
                  returns the request thread.
@@ -631,6 +662,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: None
                  If the method is called asynchronously,
                  returns the request thread.
@@ -643,6 +677,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -710,7 +745,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type=None,  # noqa: E501
+            response_type=local_var_params.get('_response_type'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
@@ -737,6 +772,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: list[Thermostat]
                  If the method is called asynchronously,
                  returns the request thread.
@@ -765,6 +803,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: tuple(list[Thermostat], status_code(int), headers(HTTPHeaderDict))
                  If the method is called asynchronously,
                  returns the request thread.
@@ -777,6 +818,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -832,7 +874,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type='list[Thermostat]',  # noqa: E501
+            response_type=local_var_params.get('_response_type', 'list[Thermostat]'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
@@ -858,6 +900,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: list[Location]
                  If the method is called asynchronously,
                  returns the request thread.
@@ -885,6 +930,9 @@ class DefaultApi(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _response_type: type to deserialize the response into instead
+                               of the declared one, e.g. 'object' for the
+                               parsed JSON.
         :return: tuple(list[Location], status_code(int), headers(HTTPHeaderDict))
                  If the method is called asynchronously,
                  returns the request thread.
@@ -897,6 +945,7 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_response_type')
 
         for key, val in six.iteritems(local_var_params['kwargs']):
             if key not in all_params:
@@ -946,7 +995,7 @@ class DefaultApi(object):
             body=body_params,
             post_params=form_params,
             files=local_var_files,
-            response_type='list[Location]',  # noqa: E501
+            response_type=local_var_params.get('_response_type', 'list[Location]'),  # noqa: E501
             auth_settings=auth_settings,
             async_req=local_var_params.get('async_req'),
             _return_http_data_only=local_var_params.get('_return_http_data_only'),  # noqa: E501
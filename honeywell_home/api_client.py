@@ -11,12 +11,9 @@
 from __future__ import absolute_import
 
 import datetime
-import json
-import mimetypes
-from multiprocessing.pool import ThreadPool
 import os
 import re
-import tempfile
+import threading
 
 # python 2 and python 3 compatibility library
 import six
@@ -71,6 +68,11 @@ class ApiClient(object):
         self.pool_threads = pool_threads
 
         self.rest_client = rest.RESTClientObject(configuration)
+        # cache_key -> (digest, response_type, deserialized object) of the
+        # last response for each url when conditional requests are enabled
+        self._deserialized = {}
+        self._decoders = {}
+        self._decoders_lock = threading.RLock()
         self.default_headers = {}
         if header_name is not None:
             self.default_headers[header_name] = header_value
@@ -90,6 +92,8 @@ class ApiClient(object):
          avoids instantiating unused threadpool for blocking clients.
         """
         if self._pool is None:
+            # Only asynchronous requests need the pool, import it on demand
+            from multiprocessing.pool import ThreadPool
             self._pool = ThreadPool(self.pool_threads)
         return self._pool
 
@@ -236,20 +240,37 @@ class ApiClient(object):
         :param response_type: class literal for
             deserialized object, or string of class name.
 
-        :return: deserialized object.
+        :return: deserialized object. When conditional requests are enabled
+            the same object is returned for identical responses, so it must
+            not be modified.
         """
         # handle file downloading
         # save response body into a tmp file and return the instance
         if response_type == "file":
             return self.__deserialize_file(response)
 
-        # fetch data from response object
+        # reuse the object built from an identical response body
+        cache_key = getattr(response, 'cache_key', None)
+        digest = getattr(response, 'digest', None)
+        if cache_key is not None and digest is not None:
+            cached = self._deserialized.get(cache_key)
+            if (cached is not None and cached[0] == digest and
+                    cached[1] == response_type):
+                return cached[2]
+
+        # fetch data from response object, parsers take the bytes as is
         try:
-            data = json.loads(response.data)
+            data = self.rest_client.codec.loads(
+                response.content if hasattr(response, 'content')
+                else response.data)
         except ValueError:
             data = response.data
 
-        return self.__deserialize(data, response_type)
+        result = self.__deserialize(data, response_type)
+        if cache_key is not None and digest is not None:
+            self._deserialized[cache_key] = (digest, response_type, result)
+
+        return result
 
     def __deserialize(self, data, klass):
         """Deserializes dict, list, str into an object.
@@ -259,36 +280,118 @@ class ApiClient(object):
 
         :return: object.
         """
-        if data is None:
-            return None
+        decoder = self._decoders.get(klass)
+        if decoder is None:
+            decoder = self.__compile(klass)
+        return decoder(data)
 
-        if type(klass) == str:
-            if klass.startswith('list['):
-                sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
+    def __compile(self, klass, pending=None):
+        """Builds the decoder for a type and caches it.
 
-            if klass.startswith('dict('):
-                sub_kls = re.match(r'dict\(([^,]*), (.*)\)', klass).group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in six.iteritems(data)}
+        Type strings are parsed and model classes are resolved once, the
+        decoder only has to walk the data.
 
-            # convert str to class
-            if klass in self.NATIVE_TYPES_MAPPING:
-                klass = self.NATIVE_TYPES_MAPPING[klass]
+        :param klass: class literal, or string of class name.
+        :param pending: decoders compiled so far that aren't cached yet.
+        :return: function that deserializes data into klass.
+        """
+        with self._decoders_lock:
+            decoder = self._decoders.get(klass)
+            if decoder is not None:
+                return decoder
+
+            # Only cache the decoders once all of them are complete so
+            # other threads never see a model without its fields
+            if pending is None:
+                pending = {}
+                decoder = self.__compile(klass, pending)
+                self._decoders.update(pending)
+                return decoder
+
+            decoder = pending.get(klass)
+            if decoder is not None:
+                return decoder
+
+            key = klass
+            if type(klass) == str:
+                if klass.startswith('list['):
+                    sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
+                    decoder = self.__list_decoder(
+                        self.__compile(sub_kls, pending))
+                    pending[key] = decoder
+                    return decoder
+
+                if klass.startswith('dict('):
+                    sub_kls = re.match(r'dict\(([^,]*), (.*)\)',
+                                       klass).group(2)
+                    decoder = self.__dict_decoder(
+                        self.__compile(sub_kls, pending))
+                    pending[key] = decoder
+                    return decoder
+
+                # convert str to class
+                if klass in self.NATIVE_TYPES_MAPPING:
+                    klass = self.NATIVE_TYPES_MAPPING[klass]
+                else:
+                    klass = getattr(honeywell_home.models, klass)
+
+            if klass in self.PRIMITIVE_TYPES:
+                decoder = self.__primitive_decoder(klass)
+            elif klass == object:
+                decoder = self.__deserialize_object
+            elif klass == datetime.date:
+                decoder = self.__optional(self.__deserialize_date)
+            elif klass == datetime.datetime:
+                decoder = self.__optional(self.__deserialize_datatime)
             else:
-                klass = getattr(honeywell_home.models, klass)
-
-        if klass in self.PRIMITIVE_TYPES:
-            return self.__deserialize_primitive(data, klass)
-        elif klass == object:
-            return self.__deserialize_object(data)
-        elif klass == datetime.date:
-            return self.__deserialize_date(data)
-        elif klass == datetime.datetime:
-            return self.__deserialize_datatime(data)
-        else:
-            return self.__deserialize_model(data, klass)
+                # Models can refer to themselves, so the decoder is known
+                # before its fields are compiled
+                fields = []
+                decoder = self.__model_decoder(klass, fields)
+                pending[key] = decoder
+                if klass.openapi_types is not None:
+                    for attr, attr_type in six.iteritems(klass.openapi_types):
+                        fields.append((attr, klass.attribute_map[attr],
+                                       self.__compile(attr_type, pending)))
+
+            pending[key] = decoder
+            return decoder
+
+    @staticmethod
+    def __optional(decoder):
+        def decode(data):
+            if data is None:
+                return None
+            return decoder(data)
+        return decode
+
+    @staticmethod
+    def __list_decoder(sub_decoder):
+        def decode(data):
+            if data is None:
+                return None
+            return [sub_decoder(sub_data) for sub_data in data]
+        return decode
+
+    @staticmethod
+    def __dict_decoder(sub_decoder):
+        def decode(data):
+            if data is None:
+                return None
+            return {k: sub_decoder(v) for k, v in six.iteritems(data)}
+        return decode
+
+    def __primitive_decoder(self, klass):
+        deserialize_primitive = self.__deserialize_primitive
+
+        def decode(data):
+            if data is None:
+                return None
+            # Most values already have the right type
+            if type(data) is klass:
+                return data
+            return deserialize_primitive(data, klass)
+        return decode
 
     def call_api(self, resource_path, method,
                  path_params=None, query_params=None, header_params=None,
@@ -452,6 +555,7 @@ class ApiClient(object):
         params = []
 
         if files:
+            import mimetypes
             for k, v in six.iteritems(files):
                 if not v:
                     continue
@@ -534,6 +638,7 @@ class ApiClient(object):
         :param response:  RESTResponse.
         :return: file path.
         """
+        import tempfile
         fd, path = tempfile.mkstemp(dir=self.configuration.temp_folder_path)
         os.close(fd)
         os.remove(path)
@@ -610,31 +715,35 @@ class ApiClient(object):
                 )
             )
 
-    def __deserialize_model(self, data, klass):
-        """Deserializes list or dict to model.
+    def __model_decoder(self, klass, fields):
+        """Returns the decoder for a model.
 
-        :param data: dict, list.
         :param klass: class literal.
-        :return: model object.
+        :param fields: list of (attribute, json key, decoder) tuples that is
+            filled in by the caller.
+        :return: function that deserializes list or dict to model.
         """
-
-        if not klass.openapi_types and not hasattr(klass,
-                                                   'get_real_child_model'):
-            return data
-
-        kwargs = {}
-        if klass.openapi_types is not None:
-            for attr, attr_type in six.iteritems(klass.openapi_types):
-                if (data is not None and
-                        klass.attribute_map[attr] in data and
-                        isinstance(data, (list, dict))):
-                    value = data[klass.attribute_map[attr]]
-                    kwargs[attr] = self.__deserialize(value, attr_type)
-
-        instance = klass(**kwargs)
-
-        if hasattr(instance, 'get_real_child_model'):
-            klass_name = instance.get_real_child_model(data)
-            if klass_name:
-                instance = self.__deserialize(data, klass_name)
-        return instance
+        has_child_model = hasattr(klass, 'get_real_child_model')
+        deserialize = self.__deserialize
+
+        def decode(data):
+            if data is None:
+                return None
+
+            if not fields and not has_child_model:
+                return data
+
+            kwargs = {}
+            if isinstance(data, (list, dict)):
+                for attr, key, decoder in fields:
+                    if key in data:
+                        kwargs[attr] = decoder(data[key])
+
+            instance = klass(**kwargs)
+
+            if has_child_model:
+                klass_name = instance.get_real_child_model(data)
+                if klass_name:
+                    instance = deserialize(data, klass_name)
+            return instance
+        return decode
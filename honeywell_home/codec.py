@@ -0,0 +1,101 @@
+# coding: utf-8
+
+"""
+    Honeywell Home
+
+    JSON codec used by the REST layer. Uses orjson or simdjson when one of
+    them is installed and the standard library json module otherwise.
+"""
+
+
+from __future__ import absolute_import
+
+import json
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+class JsonCodec(object):
+    """Parses and serializes JSON with the standard library."""
+
+    name = 'json'
+
+    def loads(self, data):
+        """Parses a JSON document.
+
+        :param data: bytes or str.
+        :return: parsed document.
+        :raise ValueError: when data isn't valid JSON.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """Serializes obj to JSON.
+
+        :param obj: object made of dicts, lists and primitive types.
+        :return: str or bytes.
+        """
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JsonCodec):
+    """Parses and serializes JSON with orjson."""
+
+    name = 'orjson'
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+
+class SimdjsonCodec(JsonCodec):
+    """Parses JSON with simdjson, serializing is left to json."""
+
+    name = 'simdjson'
+
+    def __init__(self):
+        # A parser can only be used by one thread at a time
+        self._local = threading.local()
+
+    def loads(self, data):
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = self._local.parser = simdjson.Parser()
+
+        if not isinstance(data, bytes):
+            data = data.encode('utf8')
+        return parser.parse(data, True)
+
+
+def get_codec(name=None):
+    """Returns the fastest available codec or the one named.
+
+    :param name: 'orjson', 'simdjson' or 'json'. None picks the fastest
+        one that is installed.
+    :raise ValueError: when the named codec isn't installed.
+    """
+    available = {'json': JsonCodec}
+    if simdjson is not None:
+        available['simdjson'] = SimdjsonCodec
+    if orjson is not None:
+        available['orjson'] = OrjsonCodec
+
+    if name is None:
+        for name in ('orjson', 'simdjson', 'json'):
+            if name in available:
+                break
+    elif name not in available:
+        raise ValueError("JSON codec {0} is not installed".format(name))
+
+    return available[name]()
@@ -14,7 +14,7 @@ from __future__ import absolute_import
 
 import copy
 import logging
-import multiprocessing
+import os
 import sys
 import urllib3
 
@@ -115,7 +115,7 @@ class Configuration(six.with_metaclass(TypeWithDefault, object)):
         """Set this to True/False to enable/disable SSL hostname verification.
         """
 
-        self.connection_pool_maxsize = multiprocessing.cpu_count() * 5
+        self.connection_pool_maxsize = (os.cpu_count() or 1) * 5
         """urllib3 connection pool's maximum number of connections saved
            per pool. urllib3 uses 1 connection as default value, but this is
            not the best value when you are making a lot of possibly parallel
@@ -123,6 +123,24 @@ class Configuration(six.with_metaclass(TypeWithDefault, object)):
            cpu_count * 5 is used as default value to increase performance.
         """
 
+        self.json_codec = None
+        """JSON codec used for request and response bodies: 'orjson',
+           'simdjson' or 'json'. None uses the fastest one installed.
+        """
+
+        self.connection_pool_num_pools = 4
+        """Number of per-host connection pools urllib3 keeps around.
+        """
+        self.connection_pool_block = False
+        """When True, requests wait for a free connection once maxsize
+           connections to a host are in use instead of opening an extra
+           connection that is thrown away afterwards.
+        """
+        self.tcp_keepalive = False
+        """Enable TCP keep-alive probes on pooled connections so idle
+           connections stay usable between polls.
+        """
+
         self.proxy = None
         """Proxy URL
         """
@@ -135,6 +153,15 @@ class Configuration(six.with_metaclass(TypeWithDefault, object)):
         self.retries = None
         """Adding retries to override urllib3 default value 3
         """
+        self.compress_responses = False
+        """Ask for gzip/deflate compressed responses and decode them while
+           streaming them in.
+        """
+        self.conditional_requests = False
+        """Send If-None-Match/If-Modified-Since on GET requests and reuse the
+           previous response when the server answers 304 or returns an
+           identical body.
+        """
 
     @property
     def logger_file(self):
@@ -13,36 +13,60 @@
 
 from __future__ import absolute_import
 
-# import models into model package
-from honeywell_home.models.location import Location
-from honeywell_home.models.location_configuration import LocationConfiguration
-from honeywell_home.models.location_configuration_face_recognition import LocationConfigurationFaceRecognition
-from honeywell_home.models.location_configuration_face_recognition_schedules import LocationConfigurationFaceRecognitionSchedules
-from honeywell_home.models.location_configuration_face_recognition_time import LocationConfigurationFaceRecognitionTime
-from honeywell_home.models.location_geo_fences import LocationGeoFences
-from honeywell_home.models.location_geo_occupancy import LocationGeoOccupancy
-from honeywell_home.models.location_location_role_mapping import LocationLocationRoleMapping
-from honeywell_home.models.location_users import LocationUsers
-from honeywell_home.models.thermostat import Thermostat
-from honeywell_home.models.thermostat_changeable_values import ThermostatChangeableValues
-from honeywell_home.models.thermostat_current_schedule_period import ThermostatCurrentSchedulePeriod
-from honeywell_home.models.thermostat_groups import ThermostatGroups
-from honeywell_home.models.thermostat_operation_status import ThermostatOperationStatus
-from honeywell_home.models.thermostat_schedule_capabilities import ThermostatScheduleCapabilities
-from honeywell_home.models.thermostat_schedule_type import ThermostatScheduleType
-from honeywell_home.models.thermostat_sensor import ThermostatSensor
-from honeywell_home.models.thermostat_sensor_accessories import ThermostatSensorAccessories
-from honeywell_home.models.thermostat_sensor_accessory_attribute import ThermostatSensorAccessoryAttribute
-from honeywell_home.models.thermostat_sensor_accessory_value import ThermostatSensorAccessoryValue
-from honeywell_home.models.thermostat_sensor_rooms import ThermostatSensorRooms
-from honeywell_home.models.thermostat_settings import ThermostatSettings
-from honeywell_home.models.thermostat_settings_fan import ThermostatSettingsFan
-from honeywell_home.models.thermostat_settings_fan_changeable_values import ThermostatSettingsFanChangeableValues
-from honeywell_home.models.thermostat_settings_hardware_settings import ThermostatSettingsHardwareSettings
-from honeywell_home.models.thermostat_settings_special_mode import ThermostatSettingsSpecialMode
-from honeywell_home.models.thermostat_settings_temperature_mode import ThermostatSettingsTemperatureMode
-from honeywell_home.models.thermostat_vacation_hold import ThermostatVacationHold
-from honeywell_home.models.update_fan_mode import UpdateFanMode
-from honeywell_home.models.update_priority import UpdatePriority
-from honeywell_home.models.update_priority_current_priority import UpdatePriorityCurrentPriority
-from honeywell_home.models.update_thermostat import UpdateThermostat
+import importlib
+
+# Models are imported the first time they are used, see __getattr__
+_models = {
+    'Location': 'honeywell_home.models.location',
+    'LocationConfiguration': 'honeywell_home.models.location_configuration',
+    'LocationConfigurationFaceRecognition': 'honeywell_home.models.location_configuration_face_recognition',
+    'LocationConfigurationFaceRecognitionSchedules': 'honeywell_home.models.location_configuration_face_recognition_schedules',
+    'LocationConfigurationFaceRecognitionTime': 'honeywell_home.models.location_configuration_face_recognition_time',
+    'LocationGeoFences': 'honeywell_home.models.location_geo_fences',
+    'LocationGeoOccupancy': 'honeywell_home.models.location_geo_occupancy',
+    'LocationLocationRoleMapping': 'honeywell_home.models.location_location_role_mapping',
+    'LocationUsers': 'honeywell_home.models.location_users',
+    'Thermostat': 'honeywell_home.models.thermostat',
+    'ThermostatChangeableValues': 'honeywell_home.models.thermostat_changeable_values',
+    'ThermostatCurrentSchedulePeriod': 'honeywell_home.models.thermostat_current_schedule_period',
+    'ThermostatGroups': 'honeywell_home.models.thermostat_groups',
+    'ThermostatOperationStatus': 'honeywell_home.models.thermostat_operation_status',
+    'ThermostatScheduleCapabilities': 'honeywell_home.models.thermostat_schedule_capabilities',
+    'ThermostatScheduleType': 'honeywell_home.models.thermostat_schedule_type',
+    'ThermostatSensor': 'honeywell_home.models.thermostat_sensor',
+    'ThermostatSensorAccessories': 'honeywell_home.models.thermostat_sensor_accessories',
+    'ThermostatSensorAccessoryAttribute': 'honeywell_home.models.thermostat_sensor_accessory_attribute',
+    'ThermostatSensorAccessoryValue': 'honeywell_home.models.thermostat_sensor_accessory_value',
+    'ThermostatSensorRooms': 'honeywell_home.models.thermostat_sensor_rooms',
+    'ThermostatSettings': 'honeywell_home.models.thermostat_settings',
+    'ThermostatSettingsFan': 'honeywell_home.models.thermostat_settings_fan',
+    'ThermostatSettingsFanChangeableValues': 'honeywell_home.models.thermostat_settings_fan_changeable_values',
+    'ThermostatSettingsHardwareSettings': 'honeywell_home.models.thermostat_settings_hardware_settings',
+    'ThermostatSettingsSpecialMode': 'honeywell_home.models.thermostat_settings_special_mode',
+    'ThermostatSettingsTemperatureMode': 'honeywell_home.models.thermostat_settings_temperature_mode',
+    'ThermostatVacationHold': 'honeywell_home.models.thermostat_vacation_hold',
+    'UpdateFanMode': 'honeywell_home.models.update_fan_mode',
+    'UpdatePriority': 'honeywell_home.models.update_priority',
+    'UpdatePriorityCurrentPriority': 'honeywell_home.models.update_priority_current_priority',
+    'UpdateThermostat': 'honeywell_home.models.update_thermostat',
+}
+
+__all__ = list(_models)
+
+
+def __getattr__(name):
+    """Imports a model or model module the first time it's used."""
+    if name in _models:
+        value = getattr(importlib.import_module(_models[name]), name)
+    elif __name__ + '.' + name in _models.values():
+        value = importlib.import_module(__name__ + '.' + name)
+    else:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_models))
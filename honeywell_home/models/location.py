@@ -76,6 +76,30 @@ class Location(object):
         'configuration': 'configuration'
     }
 
+    __slots__ = (
+        '_location_id',
+        '_name',
+        '_street_address',
+        '_city',
+        '_state',
+        '_country',
+        '_zipcode',
+        '_devices',
+        '_users',
+        '_time_zone_id',
+        '_time_zone',
+        '_iana_time_zone',
+        '_daylight_saving_time_enabled',
+        '_geo_fences',
+        '_geo_fence_enabled',
+        '_predictive_air_enabled',
+        '_comfort_level',
+        '_geo_fence_notification_enabled',
+        '_geo_fence_notification_type_id',
+        '_configuration',
+        'discriminator'
+    )
+
     def __init__(self, location_id=None, name=None, street_address=None, city=None, state=None, country=None, zipcode=None, devices=None, users=None, time_zone_id=None, time_zone=None, iana_time_zone=None, daylight_saving_time_enabled=None, geo_fences=None, geo_fence_enabled=None, predictive_air_enabled=None, comfort_level=None, geo_fence_notification_enabled=None, geo_fence_notification_type_id=None, configuration=None):  # noqa: E501
         """Location - a model defined in OpenAPI"""  # noqa: E501
 
@@ -599,7 +623,11 @@ class Location(object):
         if not isinstance(other, Location):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -38,6 +38,11 @@ class LocationConfiguration(object):
         'face_recognition': 'faceRecognition'
     }
 
+    __slots__ = (
+        '_face_recognition',
+        'discriminator'
+    )
+
     def __init__(self, face_recognition=None):  # noqa: E501
         """LocationConfiguration - a model defined in OpenAPI"""  # noqa: E501
 
@@ -105,7 +110,11 @@ class LocationConfiguration(object):
         if not isinstance(other, LocationConfiguration):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
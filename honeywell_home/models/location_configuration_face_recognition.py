@@ -46,6 +46,15 @@ class LocationConfigurationFaceRecognition(object):
         'schedules': 'schedules'
     }
 
+    __slots__ = (
+        '_enabled',
+        '_max_persons',
+        '_max_etas',
+        '_max_eta_persons',
+        '_schedules',
+        'discriminator'
+    )
+
     def __init__(self, enabled=None, max_persons=None, max_etas=None, max_eta_persons=None, schedules=None):  # noqa: E501
         """LocationConfigurationFaceRecognition - a model defined in OpenAPI"""  # noqa: E501
 
@@ -209,7 +218,11 @@ class LocationConfigurationFaceRecognition(object):
         if not isinstance(other, LocationConfigurationFaceRecognition):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
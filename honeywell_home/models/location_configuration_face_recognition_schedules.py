@@ -40,6 +40,12 @@ class LocationConfigurationFaceRecognitionSchedules(object):
         'days': 'days'
     }
 
+    __slots__ = (
+        '_time',
+        '_days',
+        'discriminator'
+    )
+
     def __init__(self, time=None, days=None):  # noqa: E501
         """LocationConfigurationFaceRecognitionSchedules - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class LocationConfigurationFaceRecognitionSchedules(object):
         if not isinstance(other, LocationConfigurationFaceRecognitionSchedules):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
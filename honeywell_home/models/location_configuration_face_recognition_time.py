@@ -40,6 +40,12 @@ class LocationConfigurationFaceRecognitionTime(object):
         'end': 'end'
     }
 
+    __slots__ = (
+        '_start',
+        '_end',
+        'discriminator'
+    )
+
     def __init__(self, start=None, end=None):  # noqa: E501
         """LocationConfigurationFaceRecognitionTime - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class LocationConfigurationFaceRecognitionTime(object):
         if not isinstance(other, LocationConfigurationFaceRecognitionTime):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -48,6 +48,16 @@ class LocationGeoFences(object):
         'geo_occupancy': 'geoOccupancy'
     }
 
+    __slots__ = (
+        '_geofence_enabled',
+        '_geo_fence_id',
+        '_latitude',
+        '_longitude',
+        '_radius',
+        '_geo_occupancy',
+        'discriminator'
+    )
+
     def __init__(self, geofence_enabled=None, geo_fence_id=None, latitude=None, longitude=None, radius=None, geo_occupancy=None):  # noqa: E501
         """LocationGeoFences - a model defined in OpenAPI"""  # noqa: E501
 
@@ -235,7 +245,11 @@ class LocationGeoFences(object):
         if not isinstance(other, LocationGeoFences):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -40,6 +40,12 @@ class LocationGeoOccupancy(object):
         'outside_fence': 'outsideFence'
     }
 
+    __slots__ = (
+        '_within_fence',
+        '_outside_fence',
+        'discriminator'
+    )
+
     def __init__(self, within_fence=None, outside_fence=None):  # noqa: E501
         """LocationGeoOccupancy - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class LocationGeoOccupancy(object):
         if not isinstance(other, LocationGeoOccupancy):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -44,6 +44,14 @@ class LocationLocationRoleMapping(object):
         'status': 'status'
     }
 
+    __slots__ = (
+        '_location_id',
+        '_role',
+        '_location_name',
+        '_status',
+        'discriminator'
+    )
+
     def __init__(self, location_id=None, role=None, location_name=None, status=None):  # noqa: E501
         """LocationLocationRoleMapping - a model defined in OpenAPI"""  # noqa: E501
 
@@ -183,7 +191,11 @@ class LocationLocationRoleMapping(object):
         if not isinstance(other, LocationLocationRoleMapping):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -58,6 +58,21 @@ class LocationUsers(object):
         'is_current_user': 'isCurrentUser'
     }
 
+    __slots__ = (
+        '_user_id',
+        '_username',
+        '_firstname',
+        '_lastname',
+        '_created',
+        '_deleted',
+        '_activated',
+        '_connected_home_account_exists',
+        '_location_role_mapping',
+        '_is_opt_out',
+        '_is_current_user',
+        'discriminator'
+    )
+
     def __init__(self, user_id=None, username=None, firstname=None, lastname=None, created=None, deleted=None, activated=None, connected_home_account_exists=None, location_role_mapping=None, is_opt_out=None, is_current_user=None):  # noqa: E501
         """LocationUsers - a model defined in OpenAPI"""  # noqa: E501
 
@@ -365,7 +380,11 @@ class LocationUsers(object):
         if not isinstance(other, LocationUsers):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
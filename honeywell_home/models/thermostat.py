@@ -106,6 +106,45 @@ class Thermostat(object):
         'priority_type': 'priorityType'
     }
 
+    __slots__ = (
+        '_groups',
+        '_displayed_outdoor_humidity',
+        '_vacation_hold',
+        '_current_schedule_period',
+        '_schedule_capabilities',
+        '_schedule_type',
+        '_schedule_status',
+        '_allowed_time_increments',
+        '_settings',
+        '_device_class',
+        '_device_type',
+        '_device_id',
+        '_user_defined_device_name',
+        '_name',
+        '_is_alive',
+        '_is_upgrading',
+        '_is_provisioned',
+        '_mac_id',
+        '_device_settings',
+        '_units',
+        '_indoor_temperature',
+        '_outdoor_temperature',
+        '_allowed_modes',
+        '_deadband',
+        '_has_dual_setpoint_status',
+        '_min_heat_setpoint',
+        '_max_heat_setpoint',
+        '_min_cool_setpoint',
+        '_max_cool_setpoint',
+        '_indoor_humidity',
+        '_indoor_humidity_status',
+        '_device_model',
+        '_changeable_values',
+        '_operation_status',
+        '_priority_type',
+        'discriminator'
+    )
+
     def __init__(self, groups=None, displayed_outdoor_humidity=None, vacation_hold=None, current_schedule_period=None, schedule_capabilities=None, schedule_type=None, schedule_status=None, allowed_time_increments=None, settings=None, device_class=None, device_type=None, device_id=None, user_defined_device_name=None, name=None, is_alive=None, is_upgrading=None, is_provisioned=None, mac_id=None, device_settings=None, units=None, indoor_temperature=None, outdoor_temperature=None, allowed_modes=None, deadband=None, has_dual_setpoint_status=None, min_heat_setpoint=None, max_heat_setpoint=None, min_cool_setpoint=None, max_cool_setpoint=None, indoor_humidity=None, indoor_humidity_status=None, device_model=None, changeable_values=None, operation_status=None, priority_type=None):  # noqa: E501
         """Thermostat - a model defined in OpenAPI"""  # noqa: E501
 
@@ -989,7 +1028,11 @@ class Thermostat(object):
         if not isinstance(other, Thermostat):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -56,6 +56,20 @@ class ThermostatChangeableValues(object):
         'heat_cool_mode': 'heatCoolMode'
     }
 
+    __slots__ = (
+        '_mode',
+        '_auto_changeover_active',
+        '_emergency_heat_active',
+        '_heat_setpoint',
+        '_cool_setpoint',
+        '_thermostat_setpoint_status',
+        '_next_period_time',
+        '_end_heat_setpoint',
+        '_end_cool_setpoint',
+        '_heat_cool_mode',
+        'discriminator'
+    )
+
     def __init__(self, mode=None, auto_changeover_active=None, emergency_heat_active=None, heat_setpoint=None, cool_setpoint=None, thermostat_setpoint_status=None, next_period_time=None, end_heat_setpoint=None, end_cool_setpoint=None, heat_cool_mode=None):  # noqa: E501
         """ThermostatChangeableValues - a model defined in OpenAPI"""  # noqa: E501
 
@@ -339,7 +353,11 @@ class ThermostatChangeableValues(object):
         if not isinstance(other, ThermostatChangeableValues):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -40,6 +40,12 @@ class ThermostatCurrentSchedulePeriod(object):
         'period': 'period'
     }
 
+    __slots__ = (
+        '_day',
+        '_period',
+        'discriminator'
+    )
+
     def __init__(self, day=None, period=None):  # noqa: E501
         """ThermostatCurrentSchedulePeriod - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class ThermostatCurrentSchedulePeriod(object):
         if not isinstance(other, ThermostatCurrentSchedulePeriod):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
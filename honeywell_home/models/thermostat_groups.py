@@ -42,6 +42,13 @@ class ThermostatGroups(object):
         'rooms': 'rooms'
     }
 
+    __slots__ = (
+        '_id',
+        '_name',
+        '_rooms',
+        'discriminator'
+    )
+
     def __init__(self, id=None, name=None, rooms=None):  # noqa: E501
         """ThermostatGroups - a model defined in OpenAPI"""  # noqa: E501
 
@@ -157,7 +164,11 @@ class ThermostatGroups(object):
         if not isinstance(other, ThermostatGroups):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -42,6 +42,13 @@ class ThermostatOperationStatus(object):
         'circulation_fan_request': 'circulationFanRequest'
     }
 
+    __slots__ = (
+        '_mode',
+        '_fan_request',
+        '_circulation_fan_request',
+        'discriminator'
+    )
+
     def __init__(self, mode=None, fan_request=None, circulation_fan_request=None):  # noqa: E501
         """ThermostatOperationStatus - a model defined in OpenAPI"""  # noqa: E501
 
@@ -157,7 +164,11 @@ class ThermostatOperationStatus(object):
         if not isinstance(other, ThermostatOperationStatus):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
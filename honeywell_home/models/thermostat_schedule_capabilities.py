@@ -40,6 +40,12 @@ class ThermostatScheduleCapabilities(object):
         'schedulable_fan': 'schedulableFan'
     }
 
+    __slots__ = (
+        '_available_schedule_types',
+        '_schedulable_fan',
+        'discriminator'
+    )
+
     def __init__(self, available_schedule_types=None, schedulable_fan=None):  # noqa: E501
         """ThermostatScheduleCapabilities - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class ThermostatScheduleCapabilities(object):
         if not isinstance(other, ThermostatScheduleCapabilities):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
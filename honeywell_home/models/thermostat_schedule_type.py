@@ -40,6 +40,12 @@ class ThermostatScheduleType(object):
         'schedule_sub_type': 'scheduleSubType'
     }
 
+    __slots__ = (
+        '_schedule_type',
+        '_schedule_sub_type',
+        'discriminator'
+    )
+
     def __init__(self, schedule_type=None, schedule_sub_type=None):  # noqa: E501
         """ThermostatScheduleType - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class ThermostatScheduleType(object):
         if not isinstance(other, ThermostatScheduleType):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
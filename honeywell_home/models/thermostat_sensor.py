@@ -42,6 +42,13 @@ class ThermostatSensor(object):
         'rooms': 'rooms'
     }
 
+    __slots__ = (
+        '_device_id',
+        '_group_id',
+        '_rooms',
+        'discriminator'
+    )
+
     def __init__(self, device_id=None, group_id=None, rooms=None):  # noqa: E501
         """ThermostatSensor - a model defined in OpenAPI"""  # noqa: E501
 
@@ -157,7 +164,11 @@ class ThermostatSensor(object):
         if not isinstance(other, ThermostatSensor):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
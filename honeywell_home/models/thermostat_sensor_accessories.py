@@ -42,6 +42,13 @@ class ThermostatSensorAccessories(object):
         'accessory_value': 'accessoryValue'
     }
 
+    __slots__ = (
+        '_accessory_id',
+        '_accessory_attribute',
+        '_accessory_value',
+        'discriminator'
+    )
+
     def __init__(self, accessory_id=None, accessory_attribute=None, accessory_value=None):  # noqa: E501
         """ThermostatSensorAccessories - a model defined in OpenAPI"""  # noqa: E501
 
@@ -157,7 +164,11 @@ class ThermostatSensorAccessories(object):
         if not isinstance(other, ThermostatSensorAccessories):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
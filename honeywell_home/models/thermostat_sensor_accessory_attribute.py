@@ -50,6 +50,17 @@ class ThermostatSensorAccessoryAttribute(object):
         'hardware_revision': 'hardwareRevision'
     }
 
+    __slots__ = (
+        '_type',
+        '_connection_method',
+        '_name',
+        '_model',
+        '_serial_number',
+        '_software_revision',
+        '_hardware_revision',
+        'discriminator'
+    )
+
     def __init__(self, type=None, connection_method=None, name=None, model=None, serial_number=None, software_revision=None, hardware_revision=None):  # noqa: E501
         """ThermostatSensorAccessoryAttribute - a model defined in OpenAPI"""  # noqa: E501
 
@@ -261,7 +272,11 @@ class ThermostatSensorAccessoryAttribute(object):
         if not isinstance(other, ThermostatSensorAccessoryAttribute):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -64,6 +64,24 @@ class ThermostatSensorAccessoryValue(object):
         'rssi_average': 'rssiAverage'
     }
 
+    __slots__ = (
+        '_cool_setpoint',
+        '_heat_setpoint',
+        '_indoor_humidity',
+        '_indoor_temperature',
+        '_motion_det',
+        '_occupancy_det',
+        '_exclude_temp',
+        '_exclude_motion',
+        '_pressure',
+        '_occupancy_sensitivity',
+        '_occupancy_timeout',
+        '_status',
+        '_battery_status',
+        '_rssi_average',
+        'discriminator'
+    )
+
     def __init__(self, cool_setpoint=None, heat_setpoint=None, indoor_humidity=None, indoor_temperature=None, motion_det=None, occupancy_det=None, exclude_temp=None, exclude_motion=None, pressure=None, occupancy_sensitivity=None, occupancy_timeout=None, status=None, battery_status=None, rssi_average=None):  # noqa: E501
         """ThermostatSensorAccessoryValue - a model defined in OpenAPI"""  # noqa: E501
 
@@ -443,7 +461,11 @@ class ThermostatSensorAccessoryValue(object):
         if not isinstance(other, ThermostatSensorAccessoryValue):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
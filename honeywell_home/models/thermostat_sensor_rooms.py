@@ -48,6 +48,16 @@ class ThermostatSensorRooms(object):
         'accessories': 'accessories'
     }
 
+    __slots__ = (
+        '_id',
+        '_name',
+        '_type',
+        '_avg_temperature',
+        '_avg_humidity',
+        '_accessories',
+        'discriminator'
+    )
+
     def __init__(self, id=None, name=None, type=None, avg_temperature=None, avg_humidity=None, accessories=None):  # noqa: E501
         """ThermostatSensorRooms - a model defined in OpenAPI"""  # noqa: E501
 
@@ -235,7 +245,11 @@ class ThermostatSensorRooms(object):
         if not isinstance(other, ThermostatSensorRooms):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -44,6 +44,14 @@ class ThermostatSettings(object):
         'special_mode': 'specialMode'
     }
 
+    __slots__ = (
+        '_hardware_settings',
+        '_fan',
+        '_temperature_mode',
+        '_special_mode',
+        'discriminator'
+    )
+
     def __init__(self, hardware_settings=None, fan=None, temperature_mode=None, special_mode=None):  # noqa: E501
         """ThermostatSettings - a model defined in OpenAPI"""  # noqa: E501
 
@@ -183,7 +191,11 @@ class ThermostatSettings(object):
         if not isinstance(other, ThermostatSettings):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
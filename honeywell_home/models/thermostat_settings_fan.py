@@ -40,6 +40,12 @@ class ThermostatSettingsFan(object):
         'changeable_values': 'changeableValues'
     }
 
+    __slots__ = (
+        '_allowed_modes',
+        '_changeable_values',
+        'discriminator'
+    )
+
     def __init__(self, allowed_modes=None, changeable_values=None):  # noqa: E501
         """ThermostatSettingsFan - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class ThermostatSettingsFan(object):
         if not isinstance(other, ThermostatSettingsFan):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
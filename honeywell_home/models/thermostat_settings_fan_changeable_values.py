@@ -38,6 +38,11 @@ class ThermostatSettingsFanChangeableValues(object):
         'mode': 'mode'
     }
 
+    __slots__ = (
+        '_mode',
+        'discriminator'
+    )
+
     def __init__(self, mode=None):  # noqa: E501
         """ThermostatSettingsFanChangeableValues - a model defined in OpenAPI"""  # noqa: E501
 
@@ -105,7 +110,11 @@ class ThermostatSettingsFanChangeableValues(object):
         if not isinstance(other, ThermostatSettingsFanChangeableValues):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -40,6 +40,12 @@ class ThermostatSettingsHardwareSettings(object):
         'max_brightness': 'maxBrightness'
     }
 
+    __slots__ = (
+        '_brightness',
+        '_max_brightness',
+        'discriminator'
+    )
+
     def __init__(self, brightness=None, max_brightness=None):  # noqa: E501
         """ThermostatSettingsHardwareSettings - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class ThermostatSettingsHardwareSettings(object):
         if not isinstance(other, ThermostatSettingsHardwareSettings):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -40,6 +40,12 @@ class ThermostatSettingsSpecialMode(object):
         'emergency_heat_active': 'emergencyHeatActive'
     }
 
+    __slots__ = (
+        '_auto_changeover_active',
+        '_emergency_heat_active',
+        'discriminator'
+    )
+
     def __init__(self, auto_changeover_active=None, emergency_heat_active=None):  # noqa: E501
         """ThermostatSettingsSpecialMode - a model defined in OpenAPI"""  # noqa: E501
 
@@ -131,7 +137,11 @@ class ThermostatSettingsSpecialMode(object):
         if not isinstance(other, ThermostatSettingsSpecialMode):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -38,6 +38,11 @@ class ThermostatSettingsTemperatureMode(object):
         'air': 'air'
     }
 
+    __slots__ = (
+        '_air',
+        'discriminator'
+    )
+
     def __init__(self, air=None):  # noqa: E501
         """ThermostatSettingsTemperatureMode - a model defined in OpenAPI"""  # noqa: E501
 
@@ -105,7 +110,11 @@ class ThermostatSettingsTemperatureMode(object):
         if not isinstance(other, ThermostatSettingsTemperatureMode):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -38,6 +38,11 @@ class ThermostatVacationHold(object):
         'enabled': 'enabled'
     }
 
+    __slots__ = (
+        '_enabled',
+        'discriminator'
+    )
+
     def __init__(self, enabled=None):  # noqa: E501
         """ThermostatVacationHold - a model defined in OpenAPI"""  # noqa: E501
 
@@ -105,7 +110,11 @@ class ThermostatVacationHold(object):
         if not isinstance(other, ThermostatVacationHold):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
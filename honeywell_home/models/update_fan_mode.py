@@ -38,6 +38,11 @@ class UpdateFanMode(object):
         'mode': 'mode'
     }
 
+    __slots__ = (
+        '_mode',
+        'discriminator'
+    )
+
     def __init__(self, mode=None):  # noqa: E501
         """UpdateFanMode - a model defined in OpenAPI"""  # noqa: E501
 
@@ -111,7 +116,11 @@ class UpdateFanMode(object):
         if not isinstance(other, UpdateFanMode):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
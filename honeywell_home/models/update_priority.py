@@ -38,6 +38,11 @@ class UpdatePriority(object):
         'current_priority': 'currentPriority'
     }
 
+    __slots__ = (
+        '_current_priority',
+        'discriminator'
+    )
+
     def __init__(self, current_priority=None):  # noqa: E501
         """UpdatePriority - a model defined in OpenAPI"""  # noqa: E501
 
@@ -105,7 +110,11 @@ class UpdatePriority(object):
         if not isinstance(other, UpdatePriority):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -40,6 +40,12 @@ class UpdatePriorityCurrentPriority(object):
         'selected_rooms': 'selectedRooms'
     }
 
+    __slots__ = (
+        '_priority_type',
+        '_selected_rooms',
+        'discriminator'
+    )
+
     def __init__(self, priority_type=None, selected_rooms=None):  # noqa: E501
         """UpdatePriorityCurrentPriority - a model defined in OpenAPI"""  # noqa: E501
 
@@ -137,7 +143,11 @@ class UpdatePriorityCurrentPriority(object):
         if not isinstance(other, UpdatePriorityCurrentPriority):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
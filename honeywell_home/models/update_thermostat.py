@@ -50,6 +50,17 @@ class UpdateThermostat(object):
         'next_period_time': 'nextPeriodTime'
     }
 
+    __slots__ = (
+        '_mode',
+        '_auto_changeover_active',
+        '_emergency_heat_active',
+        '_heat_setpoint',
+        '_cool_setpoint',
+        '_thermostat_setpoint_status',
+        '_next_period_time',
+        'discriminator'
+    )
+
     def __init__(self, mode=None, auto_changeover_active=None, emergency_heat_active=None, heat_setpoint=None, cool_setpoint=None, thermostat_setpoint_status=None, next_period_time=None):  # noqa: E501
         """UpdateThermostat - a model defined in OpenAPI"""  # noqa: E501
 
@@ -273,7 +284,11 @@ class UpdateThermostat(object):
         if not isinstance(other, UpdateThermostat):
             return False
 
-        return self.__dict__ == other.__dict__
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -12,18 +12,22 @@
 
 from __future__ import absolute_import
 
+import hashlib
 import io
-import json
 import logging
 import re
+import socket
 import ssl
+import threading
 
 import certifi
 # python 2 and python 3 compatibility library
 import six
 from six.moves.urllib.parse import urlencode
 import urllib3
+from urllib3.connection import HTTPConnection
 
+from honeywell_home import codec
 from honeywell_home.exceptions import ApiException, ApiValueError
 
 
@@ -32,11 +36,33 @@ logger = logging.getLogger(__name__)
 
 class RESTResponse(io.IOBase):
 
-    def __init__(self, resp):
+    def __init__(self, resp, data=None):
         self.urllib3_response = resp
         self.status = resp.status
         self.reason = resp.reason
-        self.data = resp.data
+        self.content = resp.data if data is None else data
+        """Response body as received, bytes in python 3"""
+        self._text = None
+        self.cache_key = None
+        """Key of the conditional request cache entry for this response"""
+        self.digest = None
+        """Hash of the response body when conditional requests are enabled"""
+        self.not_modified = False
+        """True when the server answered 304 and data came from the cache"""
+
+    @property
+    def data(self):
+        """Response body decoded to a string the first time it's used."""
+        if self._text is None:
+            if six.PY3 and isinstance(self.content, bytes):
+                self._text = self.content.decode('utf8')
+            else:
+                self._text = self.content
+        return self._text
+
+    @data.setter
+    def data(self, value):
+        self._text = value
 
     def getheaders(self):
         """Returns a dictionary of the response headers."""
@@ -47,9 +73,34 @@ class RESTResponse(io.IOBase):
         return self.urllib3_response.getheader(name, default)
 
 
+class ConditionalEntry(object):
+    """Validators and body of the last successful GET of a url."""
+
+    __slots__ = ('etag', 'last_modified', 'digest', 'data')
+
+    def __init__(self, etag, last_modified, digest, data):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.data = data
+
+
 class RESTClientObject(object):
 
-    def __init__(self, configuration, pools_size=4, maxsize=None):
+    STREAM_CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, configuration, pools_size=None, maxsize=None):
+        self.codec = codec.get_codec(configuration.json_codec)
+        self.conditional_requests = configuration.conditional_requests
+        self._conditional_cache = {}
+        self._conditional_lock = threading.Lock()
+        self.compress_responses = configuration.compress_responses
+        self.bytes_on_wire = 0
+        """Bytes received for compressed-capable responses before decoding"""
+        self.bytes_decoded = 0
+        """Bytes of the same responses after decoding"""
+        self._transfer_lock = threading.Lock()
+
         # urllib3.PoolManager will pass all kw parameters to connectionpool
         # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/poolmanager.py#L75  # noqa: E501
         # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/connectionpool.py#L680  # noqa: E501
@@ -82,6 +133,19 @@ class RESTClientObject(object):
             else:
                 maxsize = 4
 
+        if pools_size is None:
+            pools_size = configuration.connection_pool_num_pools
+
+        addition_pool_args['block'] = configuration.connection_pool_block
+
+        if configuration.tcp_keepalive:
+            socket_options = list(HTTPConnection.default_socket_options)
+            socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                socket_options.append(
+                    (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+            addition_pool_args['socket_options'] = socket_options
+
         # https pool manager
         if configuration.proxy:
             self.pool_manager = urllib3.ProxyManager(
@@ -125,7 +189,8 @@ class RESTClientObject(object):
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
-                                 (connection, read) timeouts.
+                                 (connection, read) timeouts or a
+                                 urllib3.Timeout.
         """
         method = method.upper()
         assert method in ['GET', 'HEAD', 'DELETE', 'POST', 'PUT',
@@ -141,7 +206,9 @@ class RESTClientObject(object):
 
         timeout = None
         if _request_timeout:
-            if isinstance(_request_timeout, (int, ) if six.PY3 else (int, long)):  # noqa: E501,F821
+            if isinstance(_request_timeout, urllib3.Timeout):
+                timeout = _request_timeout
+            elif isinstance(_request_timeout, (int, float) if six.PY3 else (int, long, float)):  # noqa: E501,F821
                 timeout = urllib3.Timeout(total=_request_timeout)
             elif (isinstance(_request_timeout, tuple) and
                   len(_request_timeout) == 2):
@@ -151,6 +218,19 @@ class RESTClientObject(object):
         if 'Content-Type' not in headers:
             headers['Content-Type'] = 'application/json'
 
+        # Ask for a compressed response and decode it while reading it
+        stream = _preload_content and self.compress_responses
+        preload_content = _preload_content and not stream
+        if stream and 'Accept-Encoding' not in headers:
+            headers['Accept-Encoding'] = 'gzip, deflate'
+
+        cache_key = None
+        entry = None
+        if self.conditional_requests and method == 'GET' and _preload_content:
+            cache_key = url
+            if query_params:
+                cache_key += '?' + urlencode(query_params)
+
         try:
             # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
             if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
@@ -159,11 +239,11 @@ class RESTClientObject(object):
                 if re.search('json', headers['Content-Type'], re.IGNORECASE):
                     request_body = None
                     if body is not None:
-                        request_body = json.dumps(body)
+                        request_body = self.codec.dumps(body)
                     r = self.pool_manager.request(
                         method, url,
                         body=request_body,
-                        preload_content=_preload_content,
+                        preload_content=preload_content,
                         timeout=timeout,
                         headers=headers)
                 elif headers['Content-Type'] == 'application/x-www-form-urlencoded':  # noqa: E501
@@ -171,7 +251,7 @@ class RESTClientObject(object):
                         method, url,
                         fields=post_params,
                         encode_multipart=False,
-                        preload_content=_preload_content,
+                        preload_content=preload_content,
                         timeout=timeout,
                         headers=headers)
                 elif headers['Content-Type'] == 'multipart/form-data':
@@ -183,7 +263,7 @@ class RESTClientObject(object):
                         method, url,
                         fields=post_params,
                         encode_multipart=True,
-                        preload_content=_preload_content,
+                        preload_content=preload_content,
                         timeout=timeout,
                         headers=headers)
                 # Pass a `string` parameter directly in the body to support
@@ -194,7 +274,7 @@ class RESTClientObject(object):
                     r = self.pool_manager.request(
                         method, url,
                         body=request_body,
-                        preload_content=_preload_content,
+                        preload_content=preload_content,
                         timeout=timeout,
                         headers=headers)
                 else:
@@ -205,9 +285,17 @@ class RESTClientObject(object):
                     raise ApiException(status=0, reason=msg)
             # For `GET`, `HEAD`
             else:
+                if cache_key is not None:
+                    with self._conditional_lock:
+                        entry = self._conditional_cache.get(cache_key)
+                    if entry is not None:
+                        if entry.etag:
+                            headers['If-None-Match'] = entry.etag
+                        if entry.last_modified:
+                            headers['If-Modified-Since'] = entry.last_modified
                 r = self.pool_manager.request(method, url,
                                               fields=query_params,
-                                              preload_content=_preload_content,
+                                              preload_content=preload_content,
                                               timeout=timeout,
                                               headers=headers)
         except urllib3.exceptions.SSLError as e:
@@ -215,21 +303,98 @@ class RESTClientObject(object):
             raise ApiException(status=0, reason=msg)
 
         if _preload_content:
-            r = RESTResponse(r)
+            if stream:
+                r = RESTResponse(r, self.__read_stream(r))
+            else:
+                r = RESTResponse(r)
 
-            # In the python 3, the response.data is bytes.
-            # we need to decode it to string.
-            if six.PY3:
-                r.data = r.data.decode('utf8')
+            if cache_key is not None:
+                r = self.__conditional_response(cache_key, entry, r)
 
+            # In the python 3, the response.content is bytes. response.data
+            # decodes it to string when it's used, parsers read the bytes.
             # log response body
-            logger.debug("response body: %s", r.data)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("response body: %s", r.data)
 
         if not 200 <= r.status <= 299:
             raise ApiException(http_resp=r)
 
         return r
 
+    def __read_stream(self, r):
+        """Reads and decodes the body of a urllib3 response chunk by chunk.
+
+        :param r: urllib3.HTTPResponse requested without preloading
+        :return: decoded body bytes
+        """
+        try:
+            data = b''.join(r.stream(self.STREAM_CHUNK_SIZE,
+                                     decode_content=True))
+            on_wire = r.tell()
+        finally:
+            r.release_conn()
+
+        with self._transfer_lock:
+            self.bytes_on_wire += on_wire
+            self.bytes_decoded += len(data)
+
+        return data
+
+    def transfer_stats(self):
+        """Returns the bytes received on the wire and after decoding."""
+        with self._transfer_lock:
+            return {'bytes_on_wire': self.bytes_on_wire,
+                    'bytes_decoded': self.bytes_decoded}
+
+    def connection_stats(self):
+        """Returns the number of connections opened and requests made.
+
+        Requests that didn't need a new connection reused a pooled one.
+        """
+        connections = 0
+        requests = 0
+        for key in self.pool_manager.pools.keys():
+            pool = self.pool_manager.pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                requests += pool.num_requests
+
+        return {'new_connections': connections,
+                'reused_connections': max(requests - connections, 0),
+                'requests': requests}
+
+    def __conditional_response(self, cache_key, entry, r):
+        """Serves a 304 from the cache or remembers the validators of a 2xx.
+
+        :param cache_key: url and query string of the request
+        :param entry: cache entry the request was made with, if any
+        :param r: RESTResponse
+        """
+        r.cache_key = cache_key
+
+        if r.status == 304 and entry is not None:
+            r.status = 200
+            r.content = entry.data
+            r.digest = entry.digest
+            r.not_modified = True
+            return r
+
+        if not 200 <= r.status <= 299:
+            return r
+
+        r.digest = hashlib.sha1(r.content).hexdigest()
+        if entry is not None and entry.digest == r.digest:
+            # Identical body, keep the copy we already have
+            r.content = entry.data
+
+        headers = r.urllib3_response.headers
+        entry = ConditionalEntry(headers.get('ETag'), headers.get('Last-Modified'), r.digest, r.content)
+        with self._conditional_lock:
+            self._conditional_cache[cache_key] = entry
+
+        return r
+
     def GET(self, url, headers=None, query_params=None, _preload_content=True,
             _request_timeout=None):
         return self.request("GET", url,
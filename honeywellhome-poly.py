@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
-from thermostat import Thermostat
-from indoor_air_sensor import IndoorAirSensor
+from thermostat import Thermostat, THERMOSTAT_PROJECTION
+from indoor_air_sensor import IndoorAirSensor, ROOM_PROJECTION
 
 import udi_interface
 import sys
 import os
-
-from api_helper import ApiHelper
+import threading
+import time
+from functools import partial
+from collections import namedtuple
+
+from api_helper import ApiHelper, DEFAULT_TIMEOUTS, DEFAULT_DEADLINE
+from poller import Poller
+from retry import RetryLater
+from circuit_breaker import CircuitOpen, StaleSnapshot, CLOSED
+from metrics import Metrics, MetricsServer
+from utilities import to_bool
 
 LOGGER = udi_interface.LOGGER
 
+Credentials = namedtuple('Credentials', ('client_id', 'client_secret', 'user_id'))
+
+# API client settings from the custom params, the fields are passed to ApiHelper as keyword arguments
+ApiSettings = namedtuple('ApiSettings', ('pool_maxsize', 'pool_block', 'keep_alive', 'pool_count', 'timeouts', 'deadline', 'fast_decode', 'calls_per_minute'))
+
 
 class Controller(udi_interface.Node):
     def __init__(self, polyglot, primary, address, name):
@@ -20,10 +34,23 @@ class Controller(udi_interface.Node):
         self._user_id = ""
         self._api_baseurl = "https://api.honeywell.com"
         self._api = None
+        self._credentials = None
+        self._settings = None
+        self._poller = Poller()
+        self._command_window = 0.5
+        self._resync_interval = 3600
+        self._last_resync = time.monotonic()
+        self._data = udi_interface.Custom(polyglot, 'customdata')
+        self._topology = {}
+        self._metrics = Metrics()
+        self._metrics_server = None
+        self._metrics_port = None
 
         polyglot.subscribe(polyglot.CUSTOMPARAMS, self.parameterHandler)
+        polyglot.subscribe(polyglot.CUSTOMDATA, self.dataHandler)
         polyglot.subscribe(polyglot.START, self.start, address)
         polyglot.subscribe(polyglot.POLL, self.poll)
+        polyglot.subscribe(polyglot.STOP, self.stop)
 
         polyglot.ready()
         polyglot.addNode(self, conn_status="ST")
@@ -44,16 +71,138 @@ class Controller(udi_interface.Node):
         else:
             LOGGER.error('check_params: user_id not defined in customParams, please add it.  Using {}'.format(self._user_id))
 
+        self._poller.configure(self._get_param(params, 'poll_workers', 4), self._get_param(params, 'poll_deadline', 240))
+        self._command_window = self._get_param(params, 'command_window', 0.5, float)
+        self._resync_interval = self._get_param(params, 'resync_interval', 3600)
+        self.configure_metrics_server(self._get_param(params, 'metrics_port', 0))
+        for node in list(self.poly.nodes()):
+            if isinstance(node, Thermostat):
+                node.command_window = self._command_window
+
         self.poly.Notices.clear()
         # Add a notice if they need to change the user/password from the default.
         if self._client_id == "" or self._client_secret == "" or self._user_id == "":
             self.poly.Notices['mynotice'] = 'Please set proper client_id and client_secret in configuration page. See:<br />https://github.com/dbarentine/udi-honeywellhome-poly/blob/master/README.md'
             return False
+
+        settings = ApiSettings(pool_maxsize=self._get_param(params, 'pool_maxsize', 4), pool_block=self._get_param(params, 'pool_block', False, to_bool),
+                               keep_alive=self._get_param(params, 'keep_alive', True, to_bool), pool_count=self._get_param(params, 'pool_count', 4), timeouts=self._get_timeouts(params),
+                               deadline=self._get_param(params, 'api_deadline', DEFAULT_DEADLINE, float, positive=True), fast_decode=self._get_param(params, 'fast_decode', False, to_bool),
+                               calls_per_minute=self._get_param(params, 'api_calls_per_minute', 60))
+        credentials = Credentials(client_id=self._client_id, client_secret=self._client_secret, user_id=self._user_id)
+        if self._api is not None and self._credentials == credentials and self._settings == settings:
+            # PG3 can send the same parameters more than once. Keep the existing API client and its connections and
+            # skip discovery when the credentials haven't changed.
+            LOGGER.debug("Credentials haven't changed, skipping discovery")
+            return True
+
+        circuit_was_open = False
+        if self._api is not None:
+            circuit_was_open = self._api.get_circuit_state() != CLOSED
+            self._api.close()
+
+        # Reuse the saved access token if it was issued to the same client
+        token = self._data['token']
+        if token is not None and token.get('client_id') != self._client_id:
+            token = None
+
+        self._api = ApiHelper(self._api_baseurl, credentials.client_id, credentials.client_secret, credentials.user_id, token=token, token_handler=self.save_token,
+                              circuit_handler=self.circuit_changed, metrics=self._metrics, **settings._asdict())
+        self._settings = settings
+
+        # Existing nodes have to use the new API client
+        for node in list(self.poly.nodes()):
+            if node is not self:
+                node.set_api(self._api)
+
+        # The new API client starts with a closed circuit and only reports changes, so the nodes would stay
+        # disconnected until it opened and closed again
+        if circuit_was_open:
+            self.circuit_changed(False)
+
+        if self._credentials == credentials:
+            LOGGER.debug("Only the API client settings changed, skipping discovery")
+            return True
+
+        self._credentials = credentials
+
+        # Start with the nodes found by the last discovery and look for changes in the background
+        topology = self._data['topology']
+        if topology is not None and topology.get('user_id') == self._user_id and not self._topology:
+            LOGGER.info("Adding nodes from the last discovery")
+            self.apply_topology(topology['nodes'])
+            threading.Thread(target=self.discover, daemon=True).start()
         else:
-            self._api = ApiHelper(self._api_baseurl, self._client_id, self._client_secret, self._user_id)
             self.discover()
-            self.setDriver('ST', 1)
-            return True
+
+        self.setDriver('ST', 1)
+        return True
+
+    def dataHandler(self, data):
+        self._data.load(data)
+
+    def save_token(self, token):
+        token['client_id'] = self._client_id
+        self._data['token'] = token
+
+    def configure_metrics_server(self, port):
+        if port == self._metrics_port:
+            return
+
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+            self._metrics_server = None
+
+        self._metrics_port = port
+        if port <= 0:
+            return
+
+        try:
+            self._metrics_server = MetricsServer(self._metrics, port)
+            LOGGER.info("Serving Honeywell API metrics on http://127.0.0.1:{0}/metrics".format(port))
+        except OSError as ex:
+            LOGGER.error("Could not serve Honeywell API metrics on port {0}: {1}".format(port, ex))
+
+    def circuit_changed(self, is_open):
+        # While the API is down the nodes keep their last values but show they aren't connected
+        if is_open:
+            LOGGER.warning("Honeywell API is unavailable, serving the last known values until it's back")
+        else:
+            LOGGER.info("Honeywell API is available again")
+
+        self.setDriver('ST', 0 if is_open else 1)
+        for node in list(self.poly.nodes()):
+            if node is not self:
+                node.set_connected(not is_open)
+
+    @staticmethod
+    def _get_param(params, name, default, cast=int, positive=False):
+        # With positive only values greater than 0 are valid
+        if name not in params or params[name] == '':
+            return default
+
+        try:
+            value = cast(params[name])
+        except ValueError:
+            value = None
+
+        if value is None or (positive and value <= 0):
+            LOGGER.error('check_params: {0} is not a valid value for {1}.  Using {2}'.format(params[name], name, default))
+            return default
+
+        return value
+
+    @classmethod
+    def _get_timeouts(cls, params):
+        # connect_timeout and read_timeout replace the default of every endpoint
+        connect = cls._get_param(params, 'connect_timeout', None, float, positive=True)
+        read = cls._get_param(params, 'read_timeout', None, float, positive=True)
+
+        timeouts = {}
+        for endpoint, (default_connect, default_read) in DEFAULT_TIMEOUTS.items():
+            timeouts[endpoint] = (default_connect if connect is None else connect, default_read if read is None else read)
+
+        return timeouts
 
     def start(self):
         LOGGER.info('Started Honeywell Home Nodeserver')
@@ -64,19 +213,132 @@ class Controller(udi_interface.Node):
         if 'longPoll' in polltype:
             self.query()
 
+        if time.monotonic() - self._last_resync >= self._resync_interval:
+            self.resync()
+
     def query(self):
-        for node in self.poly.nodes():
-            if node is not self:
-                node.query()
+        paused_for = self._api.get_paused_for() if self._api is not None else 0
+        if paused_for > 0:
+            LOGGER.warning("Honeywell API call limit reached. Skipping this poll cycle, polls resume in {0:.0f} seconds".format(paused_for))
+            return
+
+        # Thermostats are refreshed per location with a single list call instead of one call per thermostat and
+        # sensors are refreshed per thermostat group since every sensor in a group shares the same rooms payload
+        locations = {}
+        groups = {}
+        tasks = []
+        for node in list(self.poly.nodes()):
+            if isinstance(node, Thermostat):
+                node.start_poll_cycle()
+                locations.setdefault(node.location_id, []).append(node)
+            elif isinstance(node, IndoorAirSensor):
+                groups.setdefault((node.location_id, node.thermostat_id, node.group_id), []).append(node)
+            elif node is not self:
+                tasks.append((node.address, node.query))
+
+        for location_id, thermostats in locations.items():
+            tasks.append(('location {}'.format(location_id), partial(self.refresh_location, location_id, thermostats)))
+
+        for (location_id, thermostat_id, group_id), sensors in groups.items():
+            tasks.append(('group {0}/{1}'.format(thermostat_id, group_id), partial(self.refresh_sensor_group, location_id, thermostat_id, group_id, sensors)))
+
+        self._poller.run(tasks)
+
+        if self._api is None:
+            return
+
+        stats = self._api.get_transfer_stats()
+        LOGGER.debug("Honeywell API responses so far {0} bytes on the wire, {1} bytes decoded".format(stats['bytes_on_wire'], stats['bytes_decoded']))
+
+        stats = self._api.get_connection_stats()
+        LOGGER.debug("Honeywell API connections so far {0} new, {1} reused".format(stats['new_connections'], stats['reused_connections']))
+
+        stats = self._api.get_retry_stats()
+        LOGGER.debug("Honeywell API requests so far retried {0} times, {1} token refreshes, gave up {2} times, {3:.1f} seconds waiting".format(stats['retries'], stats['refreshes'], stats['gave_up'], stats['waited']))
+
+        stats = self._api.get_shared_call_stats()
+        LOGGER.debug("Honeywell API reads so far {0} made, {1} shared with a read already in flight".format(stats['made'], stats['shared']))
 
+        for endpoint, stats in sorted(self._metrics.snapshot().items()):
+            LOGGER.debug("Honeywell API {0} requests so far {1} made, {2} retries, errors {3}, latency p50 {4:.3f}s p95 {5:.3f}s p99 {6:.3f}s".format(endpoint, stats['calls'], stats['retries'], stats['errors'], stats['p50'], stats['p95'], stats['p99']))
+
+        self.update_metrics()
+
+    def update_metrics(self):
+        stats = self._metrics.totals()
+        self.setDriver('GV0', stats['calls'])
+        self.setDriver('GV1', sum(stats['errors'].values()))
+        self.setDriver('GV2', stats['retries'])
+        self.setDriver('GV3', int(stats['p95'] * 1000))
+
+    def resync(self):
+        # Drivers are only sent to the ISY when their value changes. Every so often send all of them in case the
+        # ISY missed an update.
+        LOGGER.debug("Sending all driver values to the ISY")
+        self._last_resync = time.monotonic()
+        for node in list(self.poly.nodes()):
             node.reportDrivers()
 
+    def refresh_location(self, location_id, nodes):
+        LOGGER.debug("Refreshing thermostats for location {}".format(location_id))
+        self.fetch('thermostats for location {}'.format(location_id), lambda: self._api.get_thermostats(location_id, THERMOSTAT_PROJECTION, blocking=False, stale_ok=True), partial(self.update_location, nodes))
+
+    def update_location(self, nodes, thermostats, stale=False):
+        thermostats = {thermostat.device_id: thermostat for thermostat in thermostats}
+        for node in nodes:
+            thermostat = thermostats.get(node.thermostat_id)
+
+            # Fall back to querying the thermostat on its own if it's missing from the list
+            if thermostat is None:
+                node.query()
+                continue
+
+            try:
+                node.update(thermostat, stale)
+            except Exception as ex:
+                LOGGER.exception("Refreshing thermostat %s failed %s", node.address, ex)
+
+    def refresh_sensor_group(self, location_id, thermostat_id, group_id, nodes):
+        LOGGER.debug("Refreshing sensors for thermostat {0} group {1}".format(thermostat_id, group_id))
+        self.fetch('sensors for thermostat {0} group {1}'.format(thermostat_id, group_id), lambda: self._api.get_sensors(location_id, thermostat_id, group_id, ROOM_PROJECTION, blocking=False, stale_ok=True), partial(self.update_sensor_group, nodes))
+
+    def update_sensor_group(self, nodes, rooms, stale=False):
+        rooms = {room.id: room for room in rooms}
+        for node in nodes:
+            try:
+                node.update(rooms.get(node.sensor_id), stale)
+            except Exception as ex:
+                LOGGER.exception("Could not refreshing indoor air sensor %s because %s", node.address, ex)
+
+    def fetch(self, name, request, handler):
+        # Poll requests don't wait between tries. When one can be tried again it's rescheduled on a timer so the poll
+        # worker is free for the other devices in the meantime.
+        try:
+            result = request()
+        except RetryLater as ex:
+            LOGGER.warning("Refreshing %s failed %s. Retrying in %.2f seconds", name, ex.error, ex.delay)
+            timer = threading.Timer(ex.delay, self.fetch, (name, ex.retry, handler))
+            timer.daemon = True
+            timer.start()
+            return
+        except CircuitOpen as ex:
+            LOGGER.warning("Refreshing %s skipped. %s", name, ex)
+            return
+        except Exception as ex:
+            LOGGER.exception("Refreshing %s failed %s", name, ex)
+            return
+
+        # While the API is down the last good result is handed to the nodes as stale
+        if isinstance(result, StaleSnapshot):
+            handler(result.value, True)
+        else:
+            handler(result)
+
     def discover(self, *args, **kwargs):
         try:
             LOGGER.debug("Starting discovery")
-            # If this is a re-discover than update=True
-            update = len(args) > 0
 
+            topology = {}
             locations = self._api.get_locations()
             for location in locations:
                 if location.devices is None:
@@ -84,21 +346,29 @@ class Controller(udi_interface.Node):
                     continue
 
                 for thermostat in location.devices:
-                    self.add_thermostat(location.location_id, location.name, thermostat, update)
+                    self.discover_thermostat(topology, location.location_id, location.name, thermostat)
+
+            self.apply_topology(topology)
+            self._data['topology'] = {'user_id': self._user_id, 'nodes': topology}
 
             LOGGER.info("Discovery Finished")
         except Exception as ex:
             self.poly.Notices['disc'] = 'Discovery failed please check logs for a more detailed error.'
             LOGGER.exception("Discovery failed with error %s", ex)
 
-    def add_thermostat(self, location_id, location_name, thermostat, update):
+    def discover_thermostat(self, topology, location_id, location_name, thermostat):
         t_name = location_name + ' - ' + thermostat['userDefinedDeviceName']
         t_device_id = thermostat['deviceID']
         t_addr = thermostat['macID'].lower()
         use_celsius = thermostat['units'].lower() != 'fahrenheit'
 
-        LOGGER.debug('Adding thermostat with id {0} and name {1} and addr {2}'.format(t_device_id, t_name, t_addr))
-        self.poly.addNode(Thermostat(self.poly, t_addr, t_addr, t_name, self._api, location_id, t_device_id, use_celsius), update)
+        topology[t_addr] = {
+            'type': 'thermostat',
+            'name': t_name,
+            'location_id': location_id,
+            'thermostat_id': t_device_id,
+            'use_celsius': use_celsius,
+        }
 
         if 'groups' not in thermostat:
             return
@@ -113,25 +383,73 @@ class Controller(udi_interface.Node):
 
                 # TODO: Do we ever have to care about multiple accessory blocks?
                 sensor_type = sensor.accessories[0].accessory_attribute.type
-                sensor_name = sensor.name
                 sensor_addr = t_addr + str(group_id) + str(sensor.id)
 
                 if sensor_type == 'IndoorAirSensor' or sensor_type == 'Thermostat':
-                    LOGGER.debug('Adding IndoorAirSensor with name {0} and addr {1} for thermostat {2}'.format(sensor_name, sensor_addr, t_addr))
-                    self.poly.addNode(IndoorAirSensor(self.poly, t_addr, sensor_addr, sensor_name, self._api, location_id, t_device_id, group_id, sensor.id, use_celsius))
+                    topology[sensor_addr] = {
+                        'type': 'sensor',
+                        'name': sensor.name,
+                        'primary': t_addr,
+                        'location_id': location_id,
+                        'thermostat_id': t_device_id,
+                        'group_id': group_id,
+                        'sensor_id': sensor.id,
+                        'use_celsius': use_celsius,
+                    }
+
+    def apply_topology(self, topology):
+        # Only add nodes that are new or have changed, rename the ones that only changed their name
+        # and remove the ones that are gone.
+        previous = self._topology
+        for address, node in topology.items():
+            existing = self.poly.getNode(address)
+            if existing is None or dict(previous.get(address, {}), name=node['name']) != node:
+                self.add_node(address, node)
+            elif existing.name != node['name']:
+                LOGGER.debug('Renaming node {0} to {1}'.format(address, node['name']))
+                self.poly.renameNode(address, node['name'])
+
+        for address in previous:
+            if address not in topology:
+                LOGGER.debug('Removing node {0}'.format(address))
+                self.poly.delNode(address)
+
+        self._topology = topology
+
+    def add_node(self, address, node):
+        if node['type'] == 'thermostat':
+            LOGGER.debug('Adding thermostat with id {0} and name {1} and addr {2}'.format(node['thermostat_id'], node['name'], address))
+            self.poly.addNode(Thermostat(self.poly, address, address, node['name'], self._api, node['location_id'], node['thermostat_id'], node['use_celsius'], self._command_window))
+        elif node['type'] == 'sensor':
+            LOGGER.debug('Adding IndoorAirSensor with name {0} and addr {1} for thermostat {2}'.format(node['name'], address, node['primary']))
+            self.poly.addNode(IndoorAirSensor(self.poly, node['primary'], address, node['name'], self._api, node['location_id'], node['thermostat_id'], node['group_id'], node['sensor_id'], node['use_celsius']))
 
     def delete(self):
         LOGGER.info('Honeywell Home NS Deleted')
 
     def stop(self):
+        self._poller.shutdown()
+        circuit_was_open = False
+        if self._api is not None:
+            circuit_was_open = self._api.get_circuit_state() != CLOSED
+            self._api.close()
+        if self._metrics_server is not None:
+            self._metrics_server.close()
         LOGGER.debug('Honeywell Home NS stopped.')
+        self.poly.stop()
 
     id = 'controller'
     commands = {
         'DISCOVER': discover,
     }
 
-    drivers = [{'driver': 'ST', 'value': 0, 'uom': 2}]
+    drivers = [
+        {'driver': 'ST', 'value': 0, 'uom': 2},
+        {'driver': 'GV0', 'value': 0, 'uom': 56},  # API requests
+        {'driver': 'GV1', 'value': 0, 'uom': 56},  # API errors
+        {'driver': 'GV2', 'value': 0, 'uom': 56},  # API retries
+        {'driver': 'GV3', 'value': 0, 'uom': 42},  # API latency p95
+    ]
 
 
 if __name__ == "__main__":
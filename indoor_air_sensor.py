@@ -2,6 +2,9 @@ import udi_interface
 import time
 from copy import deepcopy
 from utilities import *
+from projection import Projection
+from circuit_breaker import CircuitOpen, StaleSnapshot
+import honeywell_home.models
 
 LOGGER = udi_interface.LOGGER
 
@@ -15,6 +18,7 @@ driversMap = {
         {'driver': 'GV3', 'value': int(False), 'uom': '2'},  # Motion
         {'driver': 'GV4', 'value': int(False), 'uom': '2'},  # Occupancy
         {'driver': 'GV5', 'value': 0, 'uom': '25'},  # Battery Status
+        {'driver': 'GV6', 'value': int(False), 'uom': '2'},  # Connected
         {'driver': 'GV7', 'value': 0, 'uom': '110'},  # Poll time Epoch
     ],
     'HwhSensorC': [
@@ -26,6 +30,7 @@ driversMap = {
         {'driver': 'GV3', 'value': int(False), 'uom': '2'},  # Motion
         {'driver': 'GV4', 'value': int(False), 'uom': '2'},  # Occupancy
         {'driver': 'GV5', 'value': 0, 'uom': '25'},  # Battery Status
+        {'driver': 'GV6', 'value': int(False), 'uom': '2'},  # Connected
         {'driver': 'GV7', 'value': 0, 'uom': '110'},  # Poll time Epoch
     ]
 }
@@ -43,6 +48,22 @@ sensorBatteryStatusMap = {
 }
 
 
+# The fields of a room the node uses
+# TODO: Do we ever have to care about multiple accessory blocks?
+# We know at least one block exists otherwise the indoor_air_sensor wouldn't have been added
+ROOM_PROJECTION = Projection('RoomRecord', honeywell_home.models.ThermostatSensorRooms, {
+    'id': 'id',
+    'avg_temperature': 'avg_temperature',
+    'avg_humidity': 'avg_humidity',
+    'status': 'accessories.0.accessory_value.status',
+    'indoor_temperature': 'accessories.0.accessory_value.indoor_temperature',
+    'indoor_humidity': 'accessories.0.accessory_value.indoor_humidity',
+    'motion_det': 'accessories.0.accessory_value.motion_det',
+    'occupancy_det': 'accessories.0.accessory_value.occupancy_det',
+    'battery_status': 'accessories.0.accessory_value.battery_status',
+})
+
+
 class IndoorAirSensor(udi_interface.Node):
 
     def __init__(self, controller, primary, address, name, api, location_id, thermostat_id, group_id, sensor_id, is_celsius):
@@ -61,44 +82,70 @@ class IndoorAirSensor(udi_interface.Node):
 
         controller.subscribe(controller.START, self.start, address)
 
+    @property
+    def location_id(self):
+        return self._location_id
+
+    @property
+    def thermostat_id(self):
+        return self._thermostat_id
+
+    @property
+    def group_id(self):
+        return self._group_id
+
+    @property
+    def sensor_id(self):
+        return self._sensor_id
+
+    def set_api(self, api):
+        self._api = api
+
+    def set_connected(self, connected):
+        self.setDriver('GV6', int(connected))
+
     def start(self):
         self.query()
 
     def query(self):
         try:
             LOGGER.debug("Query sensor {}".format(self.address))
-            sensors = self._api.get_sensors(self._location_id, self._thermostat_id, self._group_id)
-
-            sensor = next((s for s in sensors.rooms if s.id == self._sensor_id), None)
-
-            if sensor is None:
-                LOGGER.error("Sensor {0} in group {1} doesn't exist".format(self.address, self._group_id))
-                self.addNotice({'mynotice': "Sensor {0} in group {1} doesn't exist. Unable to refresh sensor data.".format(self.address, self._group_id)})
-                return
-
-            # TODO: Do we ever have to care about multiple accessory blocks?
-            # We know at least one block exists otherwise the indoor_air_sensor wouldn't have been added
-            sensor_accessories = sensor.accessories[0]
-            updates = {
-                'GV0': sensorStatusMap[sensor_accessories.accessory_value.status] if sensor_accessories.accessory_value.status in sensorStatusMap else sensorStatusMap['Unknown'],
-                'ST': to_driver_value(sensor_accessories.accessory_value.indoor_temperature, False),
-                'GV1': to_driver_value(sensor.avg_temperature, False),
-                'CLIHUM': to_driver_value(sensor_accessories.accessory_value.indoor_humidity, True),
-                'GV2': to_driver_value(sensor.avg_humidity, True),
-                'GV3': int(sensor_accessories.accessory_value.motion_det),
-                'GV4': int(sensor_accessories.accessory_value.occupancy_det),
-                'GV5': sensorBatteryStatusMap[sensor_accessories.accessory_value.battery_status] if sensor_accessories.accessory_value.battery_status in sensorBatteryStatusMap else sensorBatteryStatusMap['Unknown'],
-                'GV7': int(time.time()),
-            }
-
-            for key, value in updates.items():
-                self.l_debug('_update', 'setDriver({},{})'.format(key, value))
-                self.setDriver(key, value)
-
+            rooms = self._api.get_sensors(self._location_id, self._thermostat_id, self._group_id, ROOM_PROJECTION, stale_ok=True)
+            stale = isinstance(rooms, StaleSnapshot)
+            if stale:
+                rooms = rooms.value
+
+            self.update(next((room for room in rooms if room.id == self._sensor_id), None), stale)
+        except CircuitOpen as ex:
+            LOGGER.warning("Refreshing indoor air sensor %s skipped. %s", self.address, ex)
         except Exception as ex:
             LOGGER.exception("Could not refreshing indoor air sensor %s because %s", self.address, ex)
 
-        self.reportDrivers()
+    def update(self, sensor, stale=False):
+        # Stale values come from the last good poll while the API is unavailable
+        if sensor is None:
+            LOGGER.error("Sensor {0} in group {1} doesn't exist".format(self.address, self._group_id))
+            self.addNotice({'mynotice': "Sensor {0} in group {1} doesn't exist. Unable to refresh sensor data.".format(self.address, self._group_id)})
+            return
+
+        updates = {
+            'GV0': sensorStatusMap[sensor.status] if sensor.status in sensorStatusMap else sensorStatusMap['Unknown'],
+            'ST': to_driver_value(sensor.indoor_temperature, False),
+            'GV1': to_driver_value(sensor.avg_temperature, False),
+            'CLIHUM': to_driver_value(sensor.indoor_humidity, True),
+            'GV2': to_driver_value(sensor.avg_humidity, True),
+            'GV3': int(sensor.motion_det),
+            'GV4': int(sensor.occupancy_det),
+            'GV5': sensorBatteryStatusMap[sensor.battery_status] if sensor.battery_status in sensorBatteryStatusMap else sensorBatteryStatusMap['Unknown'],
+            'GV6': int(not stale),
+        }
+
+        if not stale:
+            updates['GV7'] = int(time.time())
+
+        for key, value in updates.items():
+            self.l_debug('_update', 'setDriver({},{})'.format(key, value))
+            self.setDriver(key, value)
 
     def l_debug(self, name, string):
         LOGGER.debug("%s:%s:%s:%s: %s" % (self.id, self.address, self.name, name, string))
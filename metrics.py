@@ -0,0 +1,165 @@
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import udi_interface
+
+LOGGER = udi_interface.LOGGER
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Number of the most recent latencies per endpoint the percentiles are calculated from
+LATENCY_SAMPLES = 512
+
+
+class _EndpointMetrics:
+    __slots__ = ('calls', 'errors', 'retries', 'latency_sum', 'buckets', 'samples')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = {}
+        self.retries = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+
+
+class Metrics:
+    """
+    Thread safe counters of the requests made to the Honeywell API per endpoint: how many were made, how long they
+    took, how many failed by status and how many were retries. They are kept across API clients so changing the
+    settings doesn't reset them.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record_call(self, endpoint, seconds, error=None):
+        """Records a request that took seconds. error is the status or kind of error when it failed."""
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.calls += 1
+            metrics.latency_sum += seconds
+            metrics.samples.append(seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    metrics.buckets[i] += 1
+                    break
+
+            if error is not None:
+                metrics.errors[error] = metrics.errors.get(error, 0) + 1
+
+    def record_retry(self, endpoint):
+        with self._lock:
+            self._get(endpoint).retries += 1
+
+    def snapshot(self):
+        """Returns the counters and latency percentiles in seconds per endpoint."""
+        with self._lock:
+            return {endpoint: self._summarize(metrics.calls, metrics.errors, metrics.retries, metrics.samples) for endpoint, metrics in self._endpoints.items()}
+
+    def totals(self):
+        """Returns the counters and latency percentiles in seconds of all endpoints together."""
+        with self._lock:
+            errors = {}
+            samples = []
+            for metrics in self._endpoints.values():
+                for error, count in metrics.errors.items():
+                    errors[error] = errors.get(error, 0) + count
+                samples.extend(metrics.samples)
+
+            return self._summarize(sum(metrics.calls for metrics in self._endpoints.values()), errors, sum(metrics.retries for metrics in self._endpoints.values()), samples)
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text format."""
+        lines = [
+            '# HELP honeywell_api_requests_total Requests made to the Honeywell API.',
+            '# TYPE honeywell_api_requests_total counter',
+        ]
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for endpoint, metrics in endpoints:
+                lines.append('honeywell_api_requests_total{{endpoint="{0}"}} {1}'.format(endpoint, metrics.calls))
+
+            lines += ['# HELP honeywell_api_errors_total Requests to the Honeywell API that failed.', '# TYPE honeywell_api_errors_total counter']
+            for endpoint, metrics in endpoints:
+                for error, count in sorted(metrics.errors.items()):
+                    lines.append('honeywell_api_errors_total{{endpoint="{0}",status="{1}"}} {2}'.format(endpoint, error, count))
+
+            lines += ['# HELP honeywell_api_retries_total Requests to the Honeywell API that were retries.', '# TYPE honeywell_api_retries_total counter']
+            for endpoint, metrics in endpoints:
+                lines.append('honeywell_api_retries_total{{endpoint="{0}"}} {1}'.format(endpoint, metrics.retries))
+
+            lines += ['# HELP honeywell_api_request_duration_seconds Time the requests to the Honeywell API took.', '# TYPE honeywell_api_request_duration_seconds histogram']
+            for endpoint, metrics in endpoints:
+                count = 0
+                for bound, bucket in zip(LATENCY_BUCKETS, metrics.buckets):
+                    count += bucket
+                    lines.append('honeywell_api_request_duration_seconds_bucket{{endpoint="{0}",le="{1}"}} {2}'.format(endpoint, bound, count))
+                lines.append('honeywell_api_request_duration_seconds_bucket{{endpoint="{0}",le="+Inf"}} {1}'.format(endpoint, metrics.calls))
+                lines.append('honeywell_api_request_duration_seconds_sum{{endpoint="{0}"}} {1}'.format(endpoint, metrics.latency_sum))
+                lines.append('honeywell_api_request_duration_seconds_count{{endpoint="{0}"}} {1}'.format(endpoint, metrics.calls))
+
+        return '\n'.join(lines) + '\n'
+
+    def _get(self, endpoint):
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics()
+        return metrics
+
+    @staticmethod
+    def _summarize(calls, errors, retries, samples):
+        samples = sorted(samples)
+        return {
+            'calls': calls,
+            'errors': dict(errors),
+            'retries': retries,
+            'p50': _percentile(samples, 0.5),
+            'p95': _percentile(samples, 0.95),
+            'p99': _percentile(samples, 0.99),
+        }
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+class MetricsServer:
+    """
+    Serves the metrics in the Prometheus text format on /metrics from a background thread.
+
+    Args:
+        metrics: Metrics to serve.
+        port: Port to listen on.
+        host: Address to listen on. Defaults to the local machine only.
+    """
+    def __init__(self, metrics, port, host='127.0.0.1'):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+
+                body = metrics.to_prometheus().encode('utf8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                LOGGER.debug("Metrics request %s", format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,85 @@
+import udi_interface
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+LOGGER = udi_interface.LOGGER
+
+DEFAULT_WORKERS = 4
+
+
+class Poller:
+    """
+    Runs the refresh tasks of a poll cycle on a bounded pool of worker threads so that a cycle takes about as long
+    as the slowest device instead of the sum of all of them.
+
+    Args:
+        workers: Number of worker threads.
+        deadline: Number of seconds to wait for a cycle to finish before giving up on the remaining tasks. Tasks that
+            are still running then keep going and are skipped by the next cycles until they are done.
+    """
+    def __init__(self, workers=DEFAULT_WORKERS, deadline=240):
+        workers = self._check_workers(workers)
+        self._workers = workers
+        self._deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='poll')
+        self._lock = threading.Lock()
+        self._running = {}
+
+    @staticmethod
+    def _check_workers(workers):
+        if workers <= 0:
+            LOGGER.error("Number of poll workers must be at least 1, not {0}. Using {1}".format(workers, DEFAULT_WORKERS))
+            return DEFAULT_WORKERS
+        return workers
+
+    def configure(self, workers, deadline):
+        workers = self._check_workers(workers)
+        self._deadline = deadline
+
+        if workers != self._workers:
+            executor = self._executor
+            self._workers = workers
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='poll')
+            executor.shutdown(wait=False)
+
+    def run(self, tasks):
+        """
+        Runs each task on the worker pool and waits for them to finish or for the deadline to pass.
+        Returns False without running anything if the previous cycle is still running.
+        """
+        if not self._lock.acquire(blocking=False):
+            LOGGER.warning("Previous poll cycle is still running. Skipping this poll cycle.")
+            return False
+
+        try:
+            start = time.monotonic()
+            futures = {}
+            for name, task in tasks:
+                # Don't refresh a device again while a task from an earlier cycle that missed the deadline still is
+                running = self._running.get(name)
+                if running is not None and not running.done():
+                    LOGGER.warning("Poll task %s from an earlier cycle is still running. Skipping it this cycle.", name)
+                    continue
+
+                futures[self._executor.submit(task)] = name
+
+            done, not_done = wait(futures, timeout=self._deadline)
+            self._running = {name: future for name, future in self._running.items() if not future.done()}
+
+            for future in done:
+                if future.exception() is not None:
+                    LOGGER.error("Poll task %s failed %s", futures[future], future.exception())
+
+            for future in not_done:
+                if not future.cancel():
+                    self._running[futures[future]] = future
+                LOGGER.warning("Poll task %s did not finish within %s seconds", futures[future], self._deadline)
+
+            LOGGER.debug("Poll cycle with {0} tasks finished in {1:.2f} seconds".format(len(futures), time.monotonic() - start))
+            return True
+        finally:
+            self._lock.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
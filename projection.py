@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+import honeywell_home.models
+
+CASTS = {
+    'int': int,
+    'float': float,
+    'str': str,
+    'bool': bool,
+}
+
+
+class Projection:
+    """
+    Declares the fields the nodes read from a response and builds flat records holding only those fields.
+
+    Records can be built straight from the parsed JSON, so the rest of the response never becomes model objects,
+    or from a model that was already deserialized. Both give the same record.
+
+    Args:
+        name: Name of the record type.
+        model: Model class the fields are declared on.
+        fields: Dict of record field name to attribute path on the model. Path segments are separated by dots and
+            a number picks an item from a list, e.g. 'accessories.0.accessory_value.status'. Fields that are missing
+            from the response are None.
+    """
+    def __init__(self, name, model, fields):
+        self.model = model
+        self.record = namedtuple(name, fields.keys())
+        self._paths = [self._compile(model, path) for path in fields.values()]
+
+    @staticmethod
+    def _compile(model, path):
+        # Resolve the JSON key and the type of every segment once so building a record is only dict lookups
+        steps = []
+        klass = model
+        attr_type = None
+        for segment in path.split('.'):
+            if segment.isdigit():
+                if attr_type is None or not attr_type.startswith('list['):
+                    raise ValueError("{0} in {1} is not a list".format(segment, path))
+
+                attr_type = attr_type[5:-1]
+                steps.append((int(segment), int(segment)))
+            else:
+                if attr_type is not None:
+                    klass = getattr(honeywell_home.models, attr_type)
+
+                if segment not in klass.openapi_types:
+                    raise ValueError("{0} has no attribute {1}".format(klass.__name__, segment))
+
+                attr_type = klass.openapi_types[segment]
+                steps.append((klass.attribute_map[segment], segment))
+
+        return steps, CASTS.get(attr_type)
+
+    def from_json(self, data):
+        values = []
+        for steps, cast in self._paths:
+            value = data
+            for key, _ in steps:
+                if isinstance(key, int):
+                    value = value[key] if value is not None and len(value) > key else None
+                else:
+                    value = value.get(key) if value is not None else None
+
+            if value is not None and cast is not None and type(value) is not cast:
+                value = cast(value)
+
+            values.append(value)
+
+        return self.record._make(values)
+
+    def from_model(self, model):
+        values = []
+        for steps, _ in self._paths:
+            value = model
+            for _, attr in steps:
+                if isinstance(attr, int):
+                    value = value[attr] if value is not None and len(value) > attr else None
+                else:
+                    value = getattr(value, attr) if value is not None else None
+
+            values.append(value)
+
+        return self.record._make(values)
@@ -0,0 +1,91 @@
+import threading
+import time
+
+
+class RateLimited(Exception):
+    """Raised when a call can't be made right now. retry_after is the number of seconds until it can."""
+    def __init__(self, retry_after):
+        super().__init__('Honeywell API call limit reached, next call in {0:.2f} seconds'.format(retry_after))
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Token bucket that limits the number of calls made to the API. Calls with priority, like user commands, are let
+    through before the others and aren't held back by pause().
+
+    Args:
+        calls_per_minute: Number of calls allowed per minute on average. 0 or less means no limit.
+        burst: Number of calls that can be made at once after being idle.
+    """
+    def __init__(self, calls_per_minute=60, burst=10):
+        self._condition = threading.Condition()
+        self._rate = calls_per_minute / 60.0
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._waiting_priority = 0
+
+    def pause(self, seconds):
+        """Holds back calls without priority for the number of seconds given, e.g. from a Retry-After header."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    def paused_for(self):
+        """Returns the number of seconds calls without priority are still held back."""
+        with self._condition:
+            return max(self._paused_until - time.monotonic(), 0)
+
+    def acquire(self, priority=False, timeout=None):
+        """
+        Waits until a call can be made. Returns the number of seconds until one can be made if that is more than
+        timeout, 0 once the call can go ahead.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            if priority:
+                self._waiting_priority += 1
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait_time(now, priority)
+                    if wait == 0:
+                        if self._rate > 0:
+                            self._tokens -= 1
+                        return 0
+
+                    # Without a wait time calls with priority are waiting, they notify when they are done
+                    if end is not None:
+                        if wait is not None and now + wait > end:
+                            return wait
+                        elif wait is None and now >= end:
+                            return 1
+                        wait = end - now if wait is None else wait
+
+                    self._condition.wait(wait)
+            finally:
+                if priority:
+                    self._waiting_priority -= 1
+                    self._condition.notify_all()
+
+    def _wait_time(self, now, priority):
+        if not priority:
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            if self._waiting_priority > 0:
+                return None
+
+        if self._rate <= 0:
+            return 0
+
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens >= 1:
+            return 0
+
+        return (1 - self._tokens) / self._rate
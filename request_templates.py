@@ -0,0 +1,62 @@
+from urllib.parse import quote, quote_plus, urlencode
+
+import honeywell_home.models
+
+
+class BodyEncoder:
+    """
+    Turns a request model into the dict that gets sent as JSON. The JSON keys and nested models are looked up once
+    instead of walking the model with ApiClient.sanitize_for_serialization on every request.
+
+    Args:
+        model: Model class of the request body.
+    """
+    def __init__(self, model):
+        self._fields = []
+        for attr, attr_type in model.openapi_types.items():
+            nested = getattr(honeywell_home.models, attr_type, None)
+            self._fields.append((attr, model.attribute_map[attr], BodyEncoder(nested) if nested is not None else None))
+
+    def encode(self, obj):
+        body = {}
+        for attr, key, encoder in self._fields:
+            value = getattr(obj, attr)
+            if value is None:
+                continue
+
+            body[key] = encoder.encode(value) if encoder is not None else value
+
+        return body
+
+
+class RequestTemplate:
+    """
+    Pre-built request for one of the write endpoints that skips the generic DefaultApi path. The URL, query string
+    and headers only need the ids and the current access token filled in.
+
+    Args:
+        api_client: honeywell_home.ApiClient the requests are sent with.
+        method: HTTP method.
+        path: Path of the endpoint with a {deviceId} placeholder.
+        model: Model class of the request body.
+        client_id: Client ID sent as the apikey query parameter.
+        user_id: User ID sent in the UserRefId header.
+    """
+    def __init__(self, api_client, method, path, model, client_id, user_id):
+        self._configuration = api_client.configuration
+        self._rest_client = api_client.rest_client
+        self._method = method
+        self._url = self._configuration.host + path
+        self._query = '?' + urlencode([('apikey', client_id)]) + '&locationId='
+        self._headers = dict(api_client.default_headers)
+        self._headers['UserRefId'] = user_id
+        self._headers['Content-Type'] = 'application/json'
+        self._encoder = BodyEncoder(model)
+
+    def send(self, location_id, device_id, body, timeout=None):
+        url = self._url.format(deviceId=quote(str(device_id), safe='')) + self._query + quote_plus(str(location_id))
+
+        headers = dict(self._headers)
+        headers['Authorization'] = 'Bearer ' + self._configuration.access_token
+
+        return self._rest_client.request(self._method, url, headers=headers, body=self._encoder.encode(body), _request_timeout=timeout)
@@ -1,41 +1,115 @@
+import random
+import threading
 import time
-from functools import wraps
 
+# What to do about a failed call
+REFRESH = 'refresh'  # Try again right away, e.g. after the access token was cleared
+RETRY = 'retry'      # Try again after a backoff delay
 
-def retry(exceptions, tries=4, delay=3, backoff=2, logger=None):
+
+class RetryLater(Exception):
+    """
+    Raised instead of sleeping when the caller asked not to block. The caller should call retry() after delay
+    seconds, which continues the same call with the same attempt count and deadline.
     """
-    https://www.calazan.com/retry-decorator-for-python-3/
-    https://www.saltycrane.com/blog/2009/11/trying-out-retry-decorator-python/
-    Retry calling the decorated function using an exponential backoff.
+    def __init__(self, delay, error, retry):
+        super().__init__('{0}, Retrying in {1:.2f} seconds...'.format(error, delay))
+        self.delay = delay
+        self.error = error
+        self.retry = retry
+
+
+class DeadlineExceeded(Exception):
+    """Raised when there is no time left for a call before the deadline."""
+    def __init__(self):
+        super().__init__('No time left before the deadline')
+
+
+class RetryStats:
+    """Thread safe counters of how many calls were retried and how long they waited."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._refreshes = 0
+        self._gave_up = 0
+        self._waited = 0.0
+
+    def record_retry(self, kind, delay):
+        with self._lock:
+            if kind == REFRESH:
+                self._refreshes += 1
+            else:
+                self._retries += 1
+            self._waited += delay
+
+    def record_gave_up(self):
+        with self._lock:
+            self._gave_up += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {'retries': self._retries, 'refreshes': self._refreshes, 'gave_up': self._gave_up, 'waited': self._waited}
+
+
+class Retrier:
+    """
+    Calls a function again when it fails with an error worth retrying. The delay between tries grows exponentially
+    and is picked at random up to that limit (full jitter) so clients that failed together don't retry together.
 
     Args:
-        exceptions: The exception to check. may be a tuple of
-            exceptions to check.
+        classify: Function that gets the exception and returns REFRESH, RETRY or None if it isn't worth retrying.
+            When the exception has a retry_after attribute it's used as the delay.
         tries: Number of times to try (not retry) before giving up.
-        delay: Initial delay between retries in seconds.
-        backoff: Backoff multiplier (e.g. value of 2 will double the delay
-            each retry).
-        logger: Logger to use. If None, print.
+        base_delay: Upper limit of the delay before the first retry in seconds. It doubles with each retry.
+        max_delay: Largest upper limit of the delay in seconds.
+        deadline: Number of seconds all the tries together may take. If None there is no limit.
+        logger: Logger to use. If None nothing is logged.
     """
-    def deco_retry(f):
-
-        @wraps(f)
-        def f_retry(*args, **kwargs):
-            mtries, mdelay = tries, delay
-            while mtries > 1:
-                try:
-                    return f(*args, **kwargs)
-                except exceptions as e:
-                    msg = '{}, Retrying in {} seconds...'.format(e, mdelay)
-                    if logger:
-                        logger.warning(msg)
-                    else:
-                        print(msg)
-                    time.sleep(mdelay)
-                    mtries -= 1
-                    mdelay *= backoff
-            return f(*args, **kwargs)
-
-        return f_retry  # true decorator
-
-    return deco_retry
\ No newline at end of file
+    def __init__(self, classify, tries=3, base_delay=1, max_delay=10, deadline=None, logger=None):
+        self._classify = classify
+        self._tries = tries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._deadline = deadline
+        self._logger = logger
+        self.stats = RetryStats()
+
+    def call(self, f, blocking=True):
+        """
+        Calls f with the number of seconds left until the deadline, or None if there is no deadline, until it
+        succeeds or it's not worth trying again. With blocking=False RetryLater is raised instead of sleeping.
+        """
+        end = None if self._deadline is None else time.monotonic() + self._deadline
+        return self._run(f, blocking, end, 1)
+
+    def _run(self, f, blocking, end, attempt):
+        while True:
+            try:
+                return f(None if end is None else end - time.monotonic())
+            except Exception as ex:
+                kind = self._classify(ex)
+                if kind is None:
+                    raise
+
+                # Errors can say when to try again, e.g. from a Retry-After header
+                delay = getattr(ex, 'retry_after', None)
+                if delay is None:
+                    delay = 0 if kind == REFRESH else random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+
+                # Don't sleep past the deadline, there would be no time left for another try
+                remaining = None if end is None else end - time.monotonic()
+                if attempt >= self._tries or (remaining is not None and remaining <= delay):
+                    self.stats.record_gave_up()
+                    raise
+
+                attempt += 1
+                self.stats.record_retry(kind, delay)
+
+                if not blocking and delay > 0:
+                    next_attempt = attempt
+                    raise RetryLater(delay, ex, lambda: self._run(f, False, end, next_attempt))
+
+                if self._logger:
+                    self._logger.warning('{0}, Retrying in {1:.2f} seconds...'.format(ex, delay))
+                if delay > 0:
+                    time.sleep(delay)
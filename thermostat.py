@@ -1,7 +1,11 @@
 import udi_interface
+import threading
 import time
 from copy import deepcopy
 from utilities import *
+from projection import Projection
+from circuit_breaker import CircuitOpen, StaleSnapshot
+import honeywell_home.models
 
 LOGGER = udi_interface.LOGGER
 
@@ -97,9 +101,39 @@ holdStatusMap = {
 }
 
 
+# When the heat/cool setpoints come back as zero the thermostat is re-queried on a timer. The delay grows by
+# SETPOINT_RETRY_DELAY seconds with each attempt.
+SETPOINT_RETRY_ATTEMPTS = 10
+SETPOINT_RETRY_DELAY = 0.5
+
+# Number of seconds to wait after a command before querying the thermostat for the values it actually applied
+COMMAND_QUERY_DELAY = 5
+
+# The fields of a thermostat the node uses
+THERMOSTAT_PROJECTION = Projection('ThermostatRecord', honeywell_home.models.Thermostat, {
+    'device_id': 'device_id',
+    'indoor_temperature': 'indoor_temperature',
+    'indoor_humidity': 'indoor_humidity',
+    'schedule_status': 'schedule_status',
+    'is_alive': 'is_alive',
+    'priority_type': 'priority_type',
+    'mode': 'changeable_values.mode',
+    'auto_changeover_active': 'changeable_values.auto_changeover_active',
+    'heat_setpoint': 'changeable_values.heat_setpoint',
+    'cool_setpoint': 'changeable_values.cool_setpoint',
+    'thermostat_setpoint_status': 'changeable_values.thermostat_setpoint_status',
+    'fan_mode': 'settings.fan.changeable_values.mode',
+    'operation_mode': 'operation_status.mode',
+    'fan_request': 'operation_status.fan_request',
+    'circulation_fan_request': 'operation_status.circulation_fan_request',
+    'schedule_period': 'current_schedule_period.period',
+    'vacation_hold': 'vacation_hold.enabled',
+})
+
+
 class Thermostat(udi_interface.Node):
 
-    def __init__(self, controller, primary, address, name, api, location_id, thermostat_id, is_celsius):
+    def __init__(self, controller, primary, address, name, api, location_id, thermostat_id, is_celsius, command_window=0):
         self.controller = controller
         self._api = api
         self._location_id = location_id
@@ -108,10 +142,34 @@ class Thermostat(udi_interface.Node):
         self.type = 'thermostat'
         self.id = 'HwhC' if self._use_celsius else 'HwhF'
         self.drivers = deepcopy(driversMap[self.id])
+        self._query_timer = None
+        self._query_lock = threading.Lock()
+        self._setpoint_retries = 0
+        self._last_thermostat = None
+        self._is_alive = False
+        self.command_window = command_window
+        self._command_timer = None
+        self._command_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._pending_changes = {}
 
         super(Thermostat, self).__init__(controller, primary, address, name)
         controller.subscribe(controller.START, self.start, address)
 
+    @property
+    def location_id(self):
+        return self._location_id
+
+    @property
+    def thermostat_id(self):
+        return self._thermostat_id
+
+    def set_api(self, api):
+        self._api = api
+
+    def set_connected(self, connected):
+        self.setDriver('GV6', int(connected and self._is_alive))
+
     def start(self):
         self.query()
 
@@ -119,119 +177,202 @@ class Thermostat(udi_interface.Node):
         try:
             LOGGER.debug("Query thermostat {}".format(self.address))
 
-            # Sometimes the GET api doesn't update as quickly after an update. When this happens the heat/cool setpoints
-            # can show up as zero. So instead of displaying that to the user retry and see if we can get a good value
-            for i in range(10):
-                thermostat = self._api.get_thermostat(self._location_id, self._thermostat_id)
-                heat_setpoint = to_driver_value(thermostat.changeable_values.heat_setpoint, True)
-                cool_setpoint = to_driver_value(thermostat.changeable_values.cool_setpoint, True)
-
-                if heat_setpoint != 0 and cool_setpoint != 0:
-                    break
-
-                LOGGER.warning("Refreshing thermostat %s returned invalid heat/cool setpoints. Retry request #%s", self.address, (i+1))
-                time.sleep(0.5 * (i + 1))  # Incrementally back off the requests to give the API time to update
-
-            updates = {
-                'ST': to_driver_value(thermostat.indoor_temperature, False),
-                'CLISPH': heat_setpoint,
-                'CLISPC': cool_setpoint,
-                'CLIMD': modeMap[thermostat.changeable_values.mode],
-                'CLIFS': fanMap[thermostat.settings.fan.changeable_values.mode],
-                'CLIHUM': to_driver_value(thermostat.indoor_humidity, True),
-                'CLIHCS': runningStateMap[thermostat.operation_status.mode],
-                'CLIFRS': 1 if thermostat.operation_status.fan_request or thermostat.operation_status.circulation_fan_request else 0,  # This doesn't seem to work as expected
-                'GV1': priorityTypeMap['NotSupported'],
-                'GV2': scheduleStatusMap[thermostat.schedule_status],
-                'GV3': scheduleModeMap['NotSupported'],
-                'GV4': holdStatusMap[thermostat.changeable_values.thermostat_setpoint_status],
-                'GV5': False,
-                'GV6': int(thermostat.is_alive),
-                'GV7': int(time.time()),
-            }
-
-            if thermostat.priority_type is not None:
-                updates['GV1'] = priorityTypeMap[thermostat.priority_type]
-
-            if thermostat.current_schedule_period is not None:
-                updates['GV3'] = scheduleModeMap[thermostat.current_schedule_period.period] if thermostat.current_schedule_period.period in scheduleModeMap else scheduleModeMap['Custom']
-
-            if thermostat.vacation_hold is not None:
-                updates['GV5'] = int(thermostat.vacation_hold.enabled)
-
-            for key, value in updates.items():
-                self.l_debug('_update', 'setDriver({},{})'.format(key, value))
-                self.setDriver(key, value)
+            thermostat = self._api.get_thermostat(self._location_id, self._thermostat_id, THERMOSTAT_PROJECTION, stale_ok=True)
+            if isinstance(thermostat, StaleSnapshot):
+                self.update(thermostat.value, True)
+            else:
+                self.update(thermostat)
+        except CircuitOpen as ex:
+            LOGGER.warning("Refreshing thermostat %s skipped. %s", self.address, ex)
         except Exception as ex:
             LOGGER.exception("Refreshing thermostat %s failed %s", self.address, ex)
 
-        self.reportDrivers()
+    def start_poll_cycle(self):
+        # Each regular poll gets its own retries for invalid setpoints, otherwise they would be used up for good
+        self._setpoint_retries = 0
+
+    @staticmethod
+    def has_valid_setpoints(thermostat):
+        # Sometimes the GET api doesn't update as quickly after an update. When this happens the heat/cool setpoints
+        # can show up as zero.
+        heat_setpoint = to_driver_value(thermostat.heat_setpoint, True)
+        cool_setpoint = to_driver_value(thermostat.cool_setpoint, True)
+
+        return heat_setpoint != 0 and cool_setpoint != 0
+
+    def schedule_query(self, delay):
+        """Queries the thermostat again after delay seconds without blocking the caller."""
+        with self._query_lock:
+            if self._query_timer is not None:
+                return
+
+            self._query_timer = threading.Timer(delay, self._deferred_query)
+            self._query_timer.daemon = True
+            self._query_timer.start()
+
+    def _deferred_query(self):
+        with self._query_lock:
+            self._query_timer = None
+
+        self.query()
+
+    def update(self, thermostat, stale=False):
+        # Stale values come from the last good poll while the API is unavailable
+        if self.has_valid_setpoints(thermostat):
+            self._setpoint_retries = 0
+            self._last_thermostat = thermostat
+            heat_setpoint = to_driver_value(thermostat.heat_setpoint, True)
+            cool_setpoint = to_driver_value(thermostat.cool_setpoint, True)
+        else:
+            # Instead of displaying zero to the user keep the last good setpoints and query again later to see if we
+            # can get a good value. Incrementally back off the requests to give the API time to update.
+            heat_setpoint = self.getDriver('CLISPH')
+            cool_setpoint = self.getDriver('CLISPC')
+
+            if self._last_thermostat is None:
+                self._last_thermostat = thermostat
+
+            if self._setpoint_retries < SETPOINT_RETRY_ATTEMPTS:
+                self._setpoint_retries += 1
+                LOGGER.warning("Refreshing thermostat %s returned invalid heat/cool setpoints. Retry request #%s", self.address, self._setpoint_retries)
+                self.schedule_query(SETPOINT_RETRY_DELAY * self._setpoint_retries)
+            else:
+                LOGGER.warning("Refreshing thermostat %s returned invalid heat/cool setpoints. Waiting for the next poll.", self.address)
+
+        updates = {
+            'ST': to_driver_value(thermostat.indoor_temperature, False),
+            'CLISPH': heat_setpoint,
+            'CLISPC': cool_setpoint,
+            'CLIMD': modeMap[thermostat.mode],
+            'CLIFS': fanMap[thermostat.fan_mode],
+            'CLIHUM': to_driver_value(thermostat.indoor_humidity, True),
+            'CLIHCS': runningStateMap[thermostat.operation_mode],
+            'CLIFRS': 1 if thermostat.fan_request or thermostat.circulation_fan_request else 0,  # This doesn't seem to work as expected
+            'GV1': priorityTypeMap['NotSupported'],
+            'GV2': scheduleStatusMap[thermostat.schedule_status],
+            'GV3': scheduleModeMap['NotSupported'],
+            'GV4': holdStatusMap[thermostat.thermostat_setpoint_status],
+            'GV5': False,
+            'GV6': int(thermostat.is_alive and not stale),
+        }
+
+        self._is_alive = thermostat.is_alive
+        if not stale:
+            updates['GV7'] = int(time.time())
+
+        if thermostat.priority_type is not None:
+            updates['GV1'] = priorityTypeMap[thermostat.priority_type]
+
+        if thermostat.schedule_period is not None:
+            updates['GV3'] = scheduleModeMap[thermostat.schedule_period] if thermostat.schedule_period in scheduleModeMap else scheduleModeMap['Custom']
+
+        if thermostat.vacation_hold is not None:
+            updates['GV5'] = int(thermostat.vacation_hold)
+
+        for key, value in updates.items():
+            self.l_debug('_update', 'setDriver({},{})'.format(key, value))
+            self.setDriver(key, value)
 
     # setpoint - PH - Heat, PC - Cold, MD - Mode
     def cmdSetPF(self, cmd):
         try:
             driver = cmd['cmd']
 
-            # Get current values so we don't change the wrong things
-            thermostat = self._api.get_thermostat(self._location_id, self._thermostat_id)
-            h_setpoint = thermostat.changeable_values.heat_setpoint
-            c_setpoint = thermostat.changeable_values.cool_setpoint
-            mode = thermostat.changeable_values.mode
-            auto_changeover_active = thermostat.changeable_values.auto_changeover_active
-
-            updates = {
-                'CLISPH': to_driver_value(h_setpoint, True),
-                'CLISPC': to_driver_value(c_setpoint, True),
-                'CLIMD': modeMap[mode],
-            }
-
             if driver == 'CLISPH':
                 LOGGER.debug("Setting heat setpoint for %s to %s", self.address, to_driver_value(cmd['value'], True))
-                self._api.set_setpoint(self._location_id, self._thermostat_id, cmd['value'], c_setpoint, self._use_celsius, mode, auto_changeover_active)
-                updates['CLISPH'] = to_driver_value(cmd['value'], True)
+                self._queue_changes(heat_setpoint=float(cmd['value']), thermostat_setpoint_status='TemporaryHold')
             elif driver == 'CLISPC':
                 LOGGER.debug("Setting cool setpoint for %s to %s", self.address, to_driver_value(cmd['value'], True))
-                self._api.set_setpoint(self._location_id, self._thermostat_id, h_setpoint, cmd['value'], self._use_celsius, mode, auto_changeover_active)
-                updates['CLISPC'] = to_driver_value(cmd['value'], True)
+                self._queue_changes(cool_setpoint=float(cmd['value']), thermostat_setpoint_status='TemporaryHold')
             elif driver == 'CLIMD':
                 mode = next((key for key, value in modeMap.items() if value == int(cmd['value'])), None)
                 LOGGER.debug("Setting mode for %s to %s", self.address, mode)
-                self._api.set_setpoint(self._location_id, self._thermostat_id, h_setpoint, c_setpoint, self._use_celsius, mode, auto_changeover_active)
-                updates['CLIMD'] = cmd['value']
-
-            # Setting these values can cause other things like Hold Status to change.
-            # Query the thermostat to get updated values.
-            self.query()
-
-            LOGGER.debug("Finished setting setpoint for %s", self.address)
+                self._queue_changes(mode=mode, thermostat_setpoint_status='TemporaryHold')
         except Exception as ex:
             LOGGER.exception("Could not set thermostat set point %s because %s", self.address, ex)
 
     # Schedule Mode (Hold Mode)
     def cmdSetHoldStatus(self, cmd):
         try:
-            # Get current values so we don't change the wrong things
-            thermostat = self._api.get_thermostat(self._location_id, self._thermostat_id)
-            h_setpoint = thermostat.changeable_values.heat_setpoint
-            c_setpoint = thermostat.changeable_values.cool_setpoint
-            mode = thermostat.changeable_values.mode
-            auto_changeover_active = thermostat.changeable_values.auto_changeover_active
-
-            updates = {}
-
             host_status_mode = setHoldStatusMap[int(cmd['value'])]
             LOGGER.debug("Setting hold mode for %s to %s", self.address, host_status_mode)
+            self._queue_changes(thermostat_setpoint_status=host_status_mode)
+        except Exception as ex:
+            LOGGER.exception("Could not set thermostat hold status %s because %s", self.address, ex)
 
-            self._api.set_setpoint(self._location_id, self._thermostat_id, h_setpoint, c_setpoint, self._use_celsius, mode, auto_changeover_active, host_status_mode)
-            updates['GV4'] = cmd['value']
-
-            # Setting Hold Mode from a hold back to running can cause more than just the hold status to change.
-            # Query the thermostat to get updated values.
-            self.query()
+    def _queue_changes(self, **changes):
+        # Changes that arrive within the command window are merged and sent to the thermostat as a single update
+        with self._command_lock:
+            self._pending_changes.update(changes)
+
+            if self.command_window <= 0:
+                send_now = True
+            else:
+                send_now = False
+                if self._command_timer is None:
+                    self._command_timer = threading.Timer(self.command_window, self._send_changes)
+                    self._command_timer.daemon = True
+                    self._command_timer.start()
+
+        if send_now:
+            self._send_changes()
+
+    def _send_changes(self):
+        with self._command_lock:
+            changes = self._pending_changes
+            self._pending_changes = {}
+            self._command_timer = None
+
+        if not changes:
+            return
+
+        # The body is built from the last known values, only one send at a time can read and update them or a send
+        # that started earlier would be undone by one built from the values before it
+        with self._send_lock:
+            self._send_update(changes)
+
+    def _send_update(self, changes):
+        try:
+            # Use the last known values so we don't change the wrong things
+            values = self._get_last_thermostat()
+            h_setpoint = changes.get('heat_setpoint', values.heat_setpoint)
+            c_setpoint = changes.get('cool_setpoint', values.cool_setpoint)
+            mode = changes.get('mode', values.mode)
+            hold_status = changes.get('thermostat_setpoint_status', values.thermostat_setpoint_status)
+
+            LOGGER.debug("Updating thermostat %s with %s", self.address, changes)
+            self._api.set_setpoint(self._location_id, self._thermostat_id, h_setpoint, c_setpoint, self._use_celsius, mode, values.auto_changeover_active, hold_status)
+
+            self._update_last_thermostat(**changes)
+            self._command_updates({
+                'CLISPH': to_driver_value(h_setpoint, True),
+                'CLISPC': to_driver_value(c_setpoint, True),
+                'CLIMD': modeMap[mode],
+                'GV4': holdStatusMap[hold_status],
+            })
 
-            LOGGER.debug("Finished setting hold mode for %s to %s", self.address, host_status_mode)
+            LOGGER.debug("Finished updating thermostat %s", self.address)
         except Exception as ex:
-            LOGGER.exception("Could not set thermostat hold status %s because %s", self.address, ex)
+            LOGGER.exception("Could not update thermostat %s because %s", self.address, ex)
+
+    def _get_last_thermostat(self):
+        # Only go to the API if we haven't seen the thermostat yet
+        if self._last_thermostat is None:
+            self.update(self._api.get_thermostat(self._location_id, self._thermostat_id, THERMOSTAT_PROJECTION))
+
+        return self._last_thermostat
+
+    def _update_last_thermostat(self, **values):
+        self._last_thermostat = self._last_thermostat._replace(**values)
+
+    def _command_updates(self, updates):
+        # Let the ISY know about the new values right away. Changing these values can cause other things like
+        # Hold Status to change so check the thermostat again in the background to get the updated values.
+        for key, value in updates.items():
+            self.l_debug('_update', 'setDriver({},{})'.format(key, value))
+            self.setDriver(key, value)
+
+        self.schedule_query(COMMAND_QUERY_DELAY)
 
     # Fan Mode
     def cmdSetFS(self, cmd):
@@ -28,6 +28,19 @@ def to_half(number):
     return round(number * 2) / 2
 
 
+def to_bool(value):
+    if isinstance(value, bool):
+        return value
+
+    value = str(value).strip().lower()
+    if value in ('true', 'yes', 'on', '1'):
+        return True
+    elif value in ('false', 'no', 'off', '0'):
+        return False
+
+    raise ValueError(value)
+
+
 def get_seconds_from_midnight():
     now = datetime.now()
     return (now - now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()